@@ -0,0 +1,122 @@
+import hashlib
+import mimetypes
+import os
+import threading
+
+from structured_logging import get_logger
+
+logger = get_logger(__name__)
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+class Bundle:
+    """One packed snapshot of an alphabet folder: every image back to back plus an offset index"""
+
+    def __init__(self, name, data, entries):
+        self.name = name
+        self.data = data
+        self.entries = entries  # file name -> (offset, length, mimetype)
+        self.version = hashlib.sha256(data).hexdigest()[:16]
+
+    @property
+    def url(self):
+        # Versioned, so clients can cache it forever
+        return f"/bundle/{self.name}.bin?v={self.version}"
+
+    def index(self):
+        return {
+            'name': self.name,
+            'version': self.version,
+            'url': self.url,
+            'size': len(self.data),
+            'entries': {
+                file_name: {'offset': offset, 'length': length, 'type': mimetype}
+                for file_name, (offset, length, mimetype) in self.entries.items()
+            }
+        }
+
+
+class AlphabetBundles:
+    """Packed bundles of the fingerspelling image folders.
+
+    folders maps the folder prefix used in media paths (e.g. 'alphabetimages')
+    to its directory. A bundle is built on first use and then served from
+    memory; invalidate(directory) (wired to the media watcher) drops it so the
+    next request rebuilds it from the changed folder.
+    """
+
+    def __init__(self, folders):
+        self.folders = folders
+        self._bundles = {}  # name -> Bundle
+        self._lock = threading.Lock()
+
+    def invalidate(self, directory):
+        """Forget the bundle of a folder whose files changed"""
+        directory = os.path.abspath(directory)
+        for name, folder in self.folders.items():
+            if os.path.abspath(folder) == directory:
+                self._bundles.pop(name, None)
+
+    def get(self, name):
+        """Current Bundle for a folder, or None if there is no such alphabet folder"""
+        bundle = self._bundles.get(name)
+        if bundle is not None:
+            return bundle
+
+        directory = self.folders.get(name)
+        if directory is None or not os.path.isdir(directory):
+            return None
+
+        with self._lock:
+            bundle = self._bundles.get(name)
+            if bundle is not None:
+                return bundle
+
+            parts = []
+            entries = {}
+            offset = 0
+            for file_name in sorted(os.listdir(directory)):
+                if not file_name.lower().endswith(IMAGE_EXTENSIONS):
+                    continue
+                path = os.path.join(directory, file_name)
+                if not os.path.isfile(path):
+                    continue
+                with open(path, 'rb') as f:
+                    content = f.read()
+                parts.append(content)
+                mimetype = mimetypes.guess_type(file_name)[0] or 'application/octet-stream'
+                entries[file_name] = (offset, len(content), mimetype)
+                offset += len(content)
+
+            bundle = Bundle(name, b''.join(parts), entries)
+            self._bundles[name] = bundle
+            logger.info("Built %s bundle: %d images, %d bytes", name, len(entries), offset)
+            return bundle
+
+    def playlist(self, media_paths):
+        """Replace letter images in a playlist with references into their bundle.
+
+        Returns (playlist, bundles): playlist keeps videos as paths and turns
+        each bundled image into {'bundle', 'name', 'offset', 'length', 'type'};
+        bundles maps each bundle used to its {'url', 'version'}.
+        """
+        playlist = []
+        seen = {}
+        used = {}
+        for media_path in media_paths:
+            folder, _, file_name = media_path.partition('/')
+            if folder not in seen:
+                seen[folder] = self.get(folder) if folder in self.folders else None
+            bundle = seen[folder]
+            entry = bundle.entries.get(file_name) if bundle else None
+            if entry is None:
+                playlist.append(media_path)
+                continue
+            used[folder] = bundle
+            offset, length, mimetype = entry
+            playlist.append({'bundle': folder, 'name': file_name, 'offset': offset,
+                             'length': length, 'type': mimetype})
+
+        bundles = {name: {'url': bundle.url, 'version': bundle.version} for name, bundle in used.items()}
+        return playlist, bundles
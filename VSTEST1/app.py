@@ -1,20 +1,42 @@
-from flask import Flask, render_template, request, jsonify, send_file, Response, send_from_directory
+from flask import Flask, render_template, request, jsonify, send_file, Response, g
 from flask_cors import CORS
 import os
 import tempfile
 import base64
-import pyaudio
+import hmac
 import json
 import threading
 import queue
 import time
-from vosk import Model, KaldiRecognizer
 from datetime import datetime
+from startup_timing import startup_timer
+from structured_logging import get_logger
 
 # Import after verifying model loads correctly
 from voice_to_sign import *
 from sign_translator import SignTranslator
-from voice_to_sign import load_model, MISSING_MODELS
+from language_processor import load_nlp_async
+from voice_to_sign import load_vosk_model, MISSING_MODELS, start_media_watcher, get_sign_index, SIGN_CACHE
+from voice_to_sign import apply_sign_corrections, MEDIA_CHANGE_LISTENERS
+from voice_to_sign import local_model_path, transcribe_uploads
+from recognizer_pool import RecognizerPool, SessionManager, SESSION_TTL
+from audio_stream import RecognitionStream, align_signs
+from decode_pool import DecodePool
+from offline_transcriber import TranscriptionJobs, audio_duration, is_supported, stream_file
+from audio_socket import start_audio_socket_server
+from clip_renderer import ClipRenderer, RenderError, FFMPEG_AVAILABLE
+from media_files import send_media, MediaVersions
+from alphabet_bundle import AlphabetBundles
+from feedback_store import FeedbackStore
+from feedback_writer import FeedbackWriter
+
+# Defined after the star import above, which brings in voice_to_sign's logger
+logger = get_logger('app')
+
+# Under `python app.py` the debug reloader's first process only watches the
+# source and restarts a child that serves requests; background loading and
+# watchers run in the serving process only
+SERVING_PROCESS = __name__ != '__main__' or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'
 
 app = Flask(__name__)
 
@@ -24,186 +46,242 @@
         "origins": ["*"],
         "methods": ["GET", "POST", "OPTIONS", "HEAD"],
         "allow_headers": ["Content-Type", "Authorization", "Accept", "Accept-Language", 
-                         "Origin", "X-Requested-With"],
+                         "Origin", "X-Requested-With", "X-Session-Id"],
         "supports_credentials": True,
         "max_age": 3600
     }
 })
 
-# Add CORS headers to all responses
+# CORS headers for every response. Only preflight requests need the full set;
+# everything else (most of it /media) just needs the allowed origin.
+CORS_PREFLIGHT_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS, HEAD',
+    'Access-Control-Allow-Headers': 'Content-Type, Authorization, Accept, Accept-Language, Origin, X-Requested-With, X-Session-Id',
+    'Access-Control-Allow-Credentials': 'true',
+    'Access-Control-Max-Age': '3600'
+}
+
 @app.after_request
 def add_cors_headers(response):
-    response.headers['Access-Control-Allow-Origin'] = '*'
-    response.headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS, HEAD'
-    response.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization, Accept, Accept-Language, Origin, X-Requested-With'
-    response.headers['Access-Control-Allow-Credentials'] = 'true'
-    response.headers['Access-Control-Max-Age'] = '3600'
+    if request.method == 'OPTIONS':
+        response.headers.update(CORS_PREFLIGHT_HEADERS)
+    else:
+        response.headers['Access-Control-Allow-Origin'] = '*'
+    return response
+
+@app.after_request
+def set_session_cookie(response):
+    """Hand a newly issued session id to the client"""
+    session_id = g.get('issued_session_id')
+    if session_id:
+        response.set_cookie(SESSION_COOKIE, session_id, max_age=sessions.ttl,
+                            httponly=True, samesite='Lax')
     return response
 
-# Initialize translator
-translator = SignTranslator()
+FEEDBACK_DIR = os.path.join(os.path.dirname(__file__), 'feedback')
+FEEDBACK_FILE = os.path.join(FEEDBACK_DIR, 'feedback_data.json')
+FEEDBACK_STORE_FILE = os.path.join(FEEDBACK_DIR, 'feedback.jsonl')
+FEEDBACK_LOG = os.path.join(FEEDBACK_DIR, 'feedback.log')
+
+with startup_timer.stage('feedback'):
+    # One append-only store for all feedback; entries from the old JSON file are imported once
+    feedback_store = FeedbackStore(FEEDBACK_STORE_FILE, legacy_path=FEEDBACK_FILE)
+    # Submissions are written in batches by a background thread, drained at exit;
+    # entries approved through /feedback/review are applied to the sign index
+    feedback_writer = FeedbackWriter(
+        feedback_store,
+        log_path=FEEDBACK_LOG,
+        max_pending=int(os.environ.get('FEEDBACK_MAX_PENDING', 1000)),
+        on_write=apply_sign_corrections
+    )
+
+# Initialize translator; spaCy loads in the background and is waited for only
+# by a request that needs it before it is ready
+with startup_timer.stage('translator'):
+    translator = SignTranslator(feedback_writer=feedback_writer)
+if SERVING_PROCESS:
+    load_nlp_async()
 
 # Update the audio settings
 CHUNK_SIZE = 1024  # Smaller chunk for faster processing
 SAMPLE_RATE = 16000
-FORMAT = pyaudio.paInt16
 CHANNELS = 1
-audio_queue = queue.Queue(maxsize=10)  # Limit queue size to prevent lag
-is_recording = False
-current_model = None  # Will store the currently selected model
-current_recognizer = None
-current_language = None  # Added to store the current language
+
+def open_microphone():
+    """Open the default input device; returns (audio, stream)"""
+    import pyaudio  # Imported on first use, only servers with a microphone need it
+    audio = pyaudio.PyAudio()
+    try:
+        stream = audio.open(
+            format=pyaudio.paInt16,
+            channels=CHANNELS,
+            rate=SAMPLE_RATE,
+            input=True,
+            frames_per_buffer=CHUNK_SIZE,
+            input_device_index=None
+        )
+    except Exception:
+        audio.terminate()
+        raise
+    return audio, stream
+
+# Decoding runs on shared worker threads, off the request threads; each stream
+# has a bounded queue of pending chunks (DECODE_MAX_PENDING)
+decode_pool = DecodePool(
+    workers=int(os.environ.get('DECODE_WORKERS', 0)) or None,
+    max_pending=int(os.environ.get('DECODE_MAX_PENDING', 32))
+)
+
+# Vosk models are loaded once per language and shared; every stream checks out
+# its own recognizer, and each client (session) has its own language and stream
+recognizer_pool = RecognizerPool(load_vosk_model, sample_rate=SAMPLE_RATE)
+# Client sessions are issued by the server and dropped after SESSION_TTL idle seconds
+sessions = SessionManager(ttl=int(os.environ.get('SESSION_TTL', SESSION_TTL)))
+SESSION_COOKIE = 'session_id'
+
+# Languages whose models are loaded in the background at startup, e.g. "asl,isl"
+PRELOAD_LANGUAGES = [lang.strip().lower() for lang in os.environ.get('PRELOAD_LANGUAGES', '').split(',')
+                     if lang.strip() and lang.strip().upper() not in MISSING_MODELS]
+if SERVING_PROCESS:
+    recognizer_pool.preload(PRELOAD_LANGUAGES)
+
+def get_session_id():
+    """The session id the client sent (cookie, header, body or query), if any"""
+    data = request.get_json(silent=True) or {}
+    return (request.cookies.get(SESSION_COOKIE) or request.headers.get('X-Session-Id')
+            or data.get('session_id') or request.args.get('session_id'))
+
+def current_session():
+    """The client's session; a new one is issued if it sent no id or an unknown/expired one"""
+    session = sessions.get(get_session_id())
+    if session is None:
+        session = sessions.create()
+        g.issued_session_id = session.session_id
+    return session
 
 # Update these paths at the top of the file
 PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
 VIDEOS_PATH = os.path.join(PROJECT_DIR, "mp4videos")
 ALPHABET_IMAGES_PATH = os.path.join(PROJECT_DIR, "alphabetimages")
 INDIAN_ALPHABET_IMAGES_PATH = os.path.join(PROJECT_DIR, "indianalphabetsandnumbers")
+UPLOADS_PATH = os.path.join(PROJECT_DIR, "uploads")
 
-FEEDBACK_DIR = os.path.join(os.path.dirname(__file__), 'feedback')
-FEEDBACK_FILE = os.path.join(FEEDBACK_DIR, 'feedback_data.json')
-FEEDBACK_LOG = os.path.join(FEEDBACK_DIR, 'feedback.log')
+# Whole sentences rendered into one video (needs ffmpeg), cached by content
+RENDERED_PATH = os.path.join(PROJECT_DIR, "rendered")
+clip_renderer = ClipRenderer({
+    'mp4videos': VIDEOS_PATH,
+    'alphabetimages': ALPHABET_IMAGES_PATH,
+    'indianalphabetsandnumbers': INDIAN_ALPHABET_IMAGES_PATH,
+    'uploads': UPLOADS_PATH
+}, RENDERED_PATH, max_bytes=int(os.environ.get('RENDER_CACHE_BYTES', 512 * 1024 * 1024)))
+
+# Fingerspelling images packed into one file per alphabet, served from /bundle/
+alphabet_bundles = AlphabetBundles({
+    'alphabetimages': ALPHABET_IMAGES_PATH,
+    'indianalphabetsandnumbers': INDIAN_ALPHABET_IMAGES_PATH
+})
+# Rebuilt only when the media watcher reports a change in an alphabet folder
+MEDIA_CHANGE_LISTENERS.append(alphabet_bundles.invalidate)
+
+# Long recordings being transcribed, kept until done so they can be resumed
+transcription_jobs = TranscriptionJobs(os.path.join(PROJECT_DIR, "transcribe_jobs"))
+
+# Pick up added, removed and renamed sign media without a restart
+if SERVING_PROCESS:
+    start_media_watcher()
 
 @app.route('/select_language', methods=['POST'])
 def select_language():
-    global current_model, current_recognizer, is_recording, current_language
-    
-    # Stop any existing stream
-    is_recording = False
-    time.sleep(0.1)  # Give time for cleanup
-    
     try:
-        language = request.json.get('language', '').lower()
+        language = (request.get_json(silent=True) or {}).get('language', '').lower()
         if not language:
             return jsonify({'error': 'No language specified'}), 400
             
-        # Store current language
-        current_language = language
+        # Stop this client's stream; other clients keep theirs
+        session = current_session()
+        session_id = session.session_id
+        sessions.stop_stream(session_id)
+        session.language = language
         
-        # Try to load VOSK model, but don't fail if not available
-        try:
-            if language.upper() not in MISSING_MODELS:
-                current_model, current_recognizer = load_model(language)
-                print(f"{language.upper()} VOSK model loaded")
-            else:
-                print(f"VOSK model not available for {language.upper()}, will use fallback")
-                current_model = None
-                current_recognizer = None
-        except Exception as e:
-            print(f"VOSK model loading failed for {language.upper()}: {str(e)}, using fallback")
-            current_model = None
-            current_recognizer = None
+        # Load the VOSK model in the background so switching never blocks;
+        # clients poll /model_status until it is ready
+        if language.upper() not in MISSING_MODELS:
+            model_status = recognizer_pool.load_async(language)
+        else:
+            logger.info("VOSK model not available for %s, will use fallback", language.upper())
+            model_status = 'unavailable'
             
-        return jsonify({'status': f'{language.upper()} selected (using best available recognition method)'})
+        return jsonify({
+            'status': f'{language.upper()} selected (using best available recognition method)',
+            'model_status': model_status,
+            'session_id': session_id
+        })
             
     except Exception as e:
-        print(f"Error in language selection: {str(e)}")
+        logger.error("Error in language selection: %s", e)
         return jsonify({'error': str(e)}), 500
 
-def process_audio_stream():
-    global is_recording, current_recognizer, current_language
-    
-    if not current_recognizer:
+def utterance_expressions(text, language):
+    """Non-manual markers for a recognized utterance, from the cached translator"""
+    return translator.translate(text, language)['expressions']
+
+def process_audio_stream(session, stop_event):
+    """SSE events of one microphone stream; the session stops counting as recording when it ends"""
+    try:
+        yield from _audio_stream_events(session, stop_event)
+    finally:
+        sessions.end_stream(session.session_id, stop_event)
+
+def _audio_stream_events(session, stop_event):
+    language = session.language
+    if not language or language.upper() in MISSING_MODELS:
         yield f"data: {json.dumps({'error': 'Please select a language first'})}\n\n"
         return
+        
+    try:
+        recognizer = recognizer_pool.acquire(language)
+    except Exception as e:
+        yield f"data: {json.dumps({'error': f'Speech model unavailable: {e}'})}\n\n"
+        return
 
-    print("Starting audio stream processing...")
+    logger.info("Starting audio stream processing for session %s", session.session_id)
     audio = None
     stream = None
-    last_text = ""
-    buffer_time = 0.3  # 300ms buffer for word completion
-    last_word_time = time.time()
+    events = queue.Queue()
+    decoder = decode_pool.open(
+        RecognitionStream(recognizer, language, index=get_sign_index, expressions=utterance_expressions),
+        events.put
+    )
     
     try:
-        audio = pyaudio.PyAudio()
-        stream = audio.open(
-            format=FORMAT,
-            channels=CHANNELS,
-            rate=SAMPLE_RATE,
-            input=True,
-            frames_per_buffer=CHUNK_SIZE,
-            input_device_index=None
-        )
+        audio, stream = open_microphone()
+        logger.debug("Audio stream opened for session %s", session.session_id)
         
-        print("Audio stream opened successfully")
-        
-        while is_recording:
+        while not stop_event.is_set():
             try:
                 data = stream.read(CHUNK_SIZE, exception_on_overflow=False)
-                current_time = time.time()
-                
-                # Process partial results for immediate word recognition
-                partial = current_recognizer.PartialResult()
-                partial_dict = json.loads(partial)
-                partial_text = partial_dict.get('partial', '').strip()
-                
-                if partial_text:
-                    current_words = partial_text.split()
-                    last_words = last_text.split()
-                    
-                    # Process new complete words
-                    if len(current_words) > len(last_words):
-                        # Get the new word
-                        new_word = current_words[-1]
-                        
-                        # Only process if enough time has passed since last word
-                        if current_time - last_word_time >= buffer_time:
-                            if new_word.strip():
-                                print(f"New word recognized: {new_word}")
-                                response_data = {
-                                    'text': new_word,
-                                    'language': current_language,
-                                    'is_word': True
-                                }
-                                yield f"data: {json.dumps(response_data)}\n\n"
-                                last_word_time = current_time
-                    
-                    # Update display with current partial
-                    yield f"data: {json.dumps({'partial': partial_text})}\n\n"
-                    last_text = partial_text
-                
-                # Process final results
-                if current_recognizer.AcceptWaveform(data):
-                    result = current_recognizer.Result()
-                    result_dict = json.loads(result)
-                    text = result_dict.get('text', '').strip()
-                    
-                    if text:
-                        # Process any remaining new words
-                        current_words = text.split()
-                        last_words = last_text.split()
-                        new_words = [w for w in current_words if w not in last_words]
-                        
-                        for word in new_words:
-                            if word.strip():
-                                print(f"New word recognized (final): {word}")
-                                response_data = {
-                                    'text': word,
-                                    'language': current_language,
-                                    'is_word': True
-                                }
-                                yield f"data: {json.dumps(response_data)}\n\n"
-                                last_word_time = current_time
-                        
-                        # Update display with final text
-                        yield f"data: {json.dumps({'text': text, 'is_full': True})}\n\n"
-                        last_text = text
+                decoder.submit(data)
+                while not events.empty():
+                    for event in events.get_nowait():
+                        yield f"data: {json.dumps(event)}\n\n"
                         
             except Exception as e:
-                print(f"Error processing audio chunk: {e}")
+                logger.warning("Error processing audio chunk: %s", e)
                 continue
 
     except Exception as e:
-        print(f"Error in audio stream setup: {e}")
+        logger.error("Error in audio stream setup: %s", e)
         yield f"data: {json.dumps({'error': str(e)})}\n\n"
     finally:
-        print("Cleaning up audio resources...")
         if stream:
             stream.stop_stream()
             stream.close()
         if audio:
             audio.terminate()
-        print("Audio stream processing ended")
+        decode_pool.close(decoder)
+        recognizer_pool.release(language, recognizer)
+        logger.info("Audio stream processing ended for session %s", session.session_id)
 
 @app.route('/')
 def home():
@@ -211,17 +289,12 @@ def home():
 
 @app.route('/start_stream', methods=['GET'])
 def start_stream():
-    global is_recording
+    # Replaces any previous stream of this client only
+    session = current_session()
+    stop_event = sessions.start_stream(session.session_id)
     
-    # Make sure any previous stream is stopped
-    is_recording = False
-    time.sleep(0.1)  # Give time for cleanup
-    
-    # Start new stream
-    is_recording = True
-    
-    return Response(
-        process_audio_stream(),
+    response = Response(
+        process_audio_stream(session, stop_event),
         mimetype='text/event-stream',
         headers={
             'Cache-Control': 'no-cache',
@@ -229,14 +302,42 @@ def start_stream():
             'X-Accel-Buffering': 'no'
         }
     )
+    # Also covers a client that disconnects before the generator first runs
+    response.call_on_close(lambda: sessions.end_stream(session.session_id, stop_event))
+    return response
 
 @app.route('/stop_stream', methods=['POST'])
 def stop_stream():
-    global is_recording
-    is_recording = False
-    time.sleep(0.1)  # Give time for cleanup
+    sessions.stop_stream(get_session_id())
     return jsonify({'status': 'stopped'})
 
+@app.route('/model_status', methods=['GET'])
+def model_status():
+    """Loading state of a language's speech model: unloaded, loading, ready, error or unavailable"""
+    language = request.args.get('language', '').lower()
+    if not language:
+        return jsonify({'error': 'No language specified'}), 400
+    if language.upper() in MISSING_MODELS:
+        return jsonify({'language': language, 'model_status': 'unavailable'})
+        
+    response = {'language': language, 'model_status': recognizer_pool.status(language)}
+    if recognizer_pool.error(language):
+        response['error'] = recognizer_pool.error(language)
+    return jsonify(response)
+
+@app.route('/stats/recognizers', methods=['GET'])
+def recognizer_stats():
+    """Loaded models, pooled recognizers and live streams"""
+    return jsonify({
+        'languages': recognizer_pool.stats(),
+        'active_streams': sessions.active_streams()
+    })
+
+@app.route('/stats/decoder', methods=['GET'])
+def decoder_stats():
+    """Decode worker queue depths, dropped/coalesced chunks and decode lag"""
+    return jsonify(decode_pool.stats())
+
 @app.route('/translate_text', methods=['POST'])
 def translate_text():
     try:
@@ -246,7 +347,7 @@ def translate_text():
         if not text:
             return jsonify({'error': 'No text provided'}), 400
             
-        print(f"Translating text: '{text}' to {language}")
+        logger.debug("Translating text: %r to %s", text, language)
         
         # Get translation with context
         translation = translator.translate(text, language)
@@ -255,23 +356,123 @@ def translate_text():
         video_paths = text_to_sign(translation['signs'], language)
         
         if not video_paths:
-            print("Warning: No video paths generated for text")
             return jsonify({'error': 'No signs found for the given text'}), 404
             
-        print(f"Generated {len(video_paths)} video paths")
-        
         response = {
             'video_paths': video_paths,
+            'media_urls': media_versions.urls(video_paths),
             'expressions': translation['expressions'],
             'context': translation.get('context', {})
         }
         
+        # Letters as offsets into the cached alphabet bundle instead of one URL each
+        if request.json.get('spelling') == 'bundle':
+            response['playlist'], response['bundles'] = alphabet_bundles.playlist(video_paths)
+        
         return jsonify(response)
         
     except Exception as e:
-        print(f"Error in translate_text: {str(e)}")
+        logger.error("Error in translate_text: %s", e)
         return jsonify({'error': str(e)}), 500
 
+# Number of texts sent through spaCy together by /translate_batch
+TRANSLATE_BATCH_SIZE = 64
+# Most texts accepted by one /translate_batch request
+TRANSLATE_BATCH_MAX = int(os.environ.get('TRANSLATE_BATCH_MAX', 1000))
+
+@app.route('/translate_batch', methods=['POST'])
+def translate_batch():
+    """Translate many texts in one request, streaming one NDJSON line per text.
+    
+    Body: {"texts": [...], "language": "asl"} or {"texts": [...], "languages": [...]}
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        texts = data.get('texts')
+        languages = data.get('languages') or data.get('language', 'asl')
+        
+        if not isinstance(texts, list) or not texts:
+            return jsonify({'error': 'No texts provided'}), 400
+        if len(texts) > TRANSLATE_BATCH_MAX:
+            return jsonify({'error': f'At most {TRANSLATE_BATCH_MAX} texts per request'}), 413
+        if isinstance(languages, str):
+            languages = [languages] * len(texts)
+        if not isinstance(languages, list) or not all(isinstance(language, str) for language in languages):
+            return jsonify({'error': 'languages must be strings'}), 400
+        if len(languages) != len(texts):
+            return jsonify({'error': 'languages must have one entry per text'}), 400
+        texts = [text if isinstance(text, str) else '' for text in texts]
+            
+    except Exception as e:
+        logger.error("Error in translate_batch: %s", e)
+        return jsonify({'error': str(e)}), 500
+        
+    def generate():
+        # Resolve the whole batch against one index snapshot
+        index = get_sign_index()
+        translations = None
+        
+        for i, (text, language) in enumerate(zip(texts, languages)):
+            try:
+                if translations is None:
+                    translations = iter(translator.translate_many(
+                        texts, languages, batch_size=TRANSLATE_BATCH_SIZE))
+                translation = next(translations)
+            except Exception as e:
+                # The batch translation itself failed: report every remaining item
+                logger.error("Error in translate_batch at item %d: %s", i, e)
+                for j in range(i, len(texts)):
+                    yield json.dumps({'index': j, 'error': str(e)}, ensure_ascii=False) + "\n"
+                return
+                
+            try:
+                if not text:
+                    result = {'index': i, 'error': 'No text provided'}
+                else:
+                    video_paths = text_to_sign(translation['signs'], language, index=index)
+                    result = {
+                        'index': i,
+                        'video_paths': video_paths,
+                        'media_urls': media_versions.urls(video_paths),
+                        'expressions': translation['expressions'],
+                        'context': translation.get('context', {})
+                    }
+                    if not video_paths:
+                        result['error'] = 'No signs found for the given text'
+            except Exception as e:
+                logger.warning("Error translating batch item %d: %s", i, e)
+                result = {'index': i, 'error': str(e)}
+                
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+            
+    return Response(
+        generate(),
+        mimetype='application/x-ndjson',
+        headers={'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/stats/nlp', methods=['GET'])
+def nlp_stats():
+    """Per-stage timing of the context analysis pipeline"""
+    analyzer = translator.context_analyzer
+    return jsonify({
+        'pipeline': analyzer.nlp.pipe_names if analyzer.nlp else [],
+        'stages': analyzer.timings.report()
+    })
+
+@app.route('/stats/startup', methods=['GET'])
+def startup_stats():
+    """How long each startup stage took in this process"""
+    return jsonify(startup_timer.report())
+
+@app.route('/stats/cache', methods=['GET'])
+def cache_stats():
+    """Hit/miss/eviction counters of the translation and sign playlist caches"""
+    return jsonify({
+        'translation': translator.cache.stats(),
+        'signs': SIGN_CACHE.stats()
+    })
+
 @app.route('/speech_to_text', methods=['POST'])
 def speech_to_text():
     """Convert speech to text using Web Speech API or SpeechRecognition as fallback"""
@@ -280,36 +481,21 @@ def speech_to_text():
         # or can handle audio file uploads as fallback
         if 'audio' in request.files:
             audio_file = request.files['audio']
-            language = request.form.get('language', 'en-US')
-            
-            # Use SpeechRecognition library as fallback
-            import speech_recognition as sr
-            r = sr.Recognizer()
+            language = request.form.get('language', 'asl')
             
-            try:
-                with sr.AudioFile(audio_file) as source:
-                    audio = r.record(source)
-                    
-                # Map language codes
-                lang_map = {
-                    'asl': 'en-US',
-                    'isl': 'en-IN', 
-                    'hindi': 'hi-IN',
-                    'telugu': 'te-IN',
-                    'gujarati': 'gu-IN'
-                }
-                
-                recognition_lang = lang_map.get(language, 'en-US')
-                text = r.recognize_google(audio, language=recognition_lang)
-                
-                return jsonify({
-                    'text': text,
-                    'language': language,
-                    'method': 'speech_recognition'
-                })
+            # Local Vosk decoding where a model exists, SpeechRecognition otherwise
+            result = transcribe_uploads([audio_file], language)[0]
+            if 'error' in result:
+                return jsonify({'error': f"Speech recognition failed: {result['error']}"}), 500
                 
-            except Exception as e:
-                return jsonify({'error': f'Speech recognition failed: {str(e)}'}), 500
+            return jsonify({
+                'text': result['text'],
+                'language': language,
+                'method': 'vosk' if result['method'] == 'vosk' else 'speech_recognition',
+                'signs': result.get('signs', []),
+                'video_paths': result['video_paths'],
+                'media_urls': media_versions.urls(result['video_paths'])
+            })
                 
         else:
             # If no audio file, return success (frontend will use Web Speech API)
@@ -319,48 +505,97 @@ def speech_to_text():
             })
             
     except Exception as e:
-        print(f"Error in speech_to_text: {str(e)}")
+        logger.error("Error in speech_to_text: %s", e)
         return jsonify({'error': str(e)}), 500
 
-def save_feedback(original, correction):
-    """Save feedback to both JSON and log file"""
-    # Create feedback directory if it doesn't exist
-    if not os.path.exists(FEEDBACK_DIR):
-        os.makedirs(FEEDBACK_DIR)
-    
-    # Get current timestamp
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    # Save to JSON file
-    feedback_entry = {
-        "timestamp": timestamp,
-        "original": original,
-        "correction": correction
-    }
+@app.route('/transcribe_batch', methods=['POST'])
+def transcribe_batch():
+    """Transcribe several uploaded audio files ('audio' fields) and resolve each to signs"""
+    try:
+        audio_files = request.files.getlist('audio')
+        language = request.form.get('language', 'asl')
+        
+        if not audio_files:
+            return jsonify({'error': 'No audio files provided'}), 400
+            
+        results = transcribe_uploads(audio_files, language)
+        for audio_file, result in zip(audio_files, results):
+            result['filename'] = audio_file.filename
+        return jsonify({'language': language, 'results': results})
+        
+    except Exception as e:
+        logger.error("Error in transcribe_batch: %s", e)
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/transcribe_stream', methods=['POST'])
+def transcribe_stream():
+    """Transcribe a long recording incrementally, streaming one result per utterance.
     
+    Start a job by uploading 'audio' (mono 16-bit PCM WAV or raw 16 kHz PCM) with a
+    'language'; resume an interrupted one by sending its job_id, optionally with the
+    offset to restart from (by default the last segment that was delivered).
+    Output is NDJSON, or SSE with format=sse: a first line with the job_id, one line
+    per segment with its text, timed signs and resume offset, then {"done": true}.
+    """
     try:
-        # Load existing feedback
-        if os.path.exists(FEEDBACK_FILE):
-            with open(FEEDBACK_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+        job_id = request.values.get('job_id')
+        if job_id:
+            job = transcription_jobs.get(job_id)
+            if job is None:
+                return jsonify({'error': 'Unknown or finished job'}), 404
+            offset = request.values.get('offset', job['offset'], type=int)
+        elif 'audio' in request.files:
+            language = request.values.get('language', 'asl').lower()
+            if not local_model_path(language):
+                return jsonify({'error': f'No local speech model for {language}'}), 400
+            job = transcription_jobs.create(request.files['audio'], language)
+            if not is_supported(job['path']):
+                transcription_jobs.finish(job)
+                return jsonify({'error': 'Audio must be mono 16-bit PCM WAV or raw 16 kHz PCM'}), 400
+            offset = 0
         else:
-            data = {"feedback": []}
+            return jsonify({'error': 'No audio file or job_id provided'}), 400
+            
+        language = job['language']
+        model = recognizer_pool.get_model(language)
+        duration = audio_duration(job['path'])
+        
+    except Exception as e:
+        logger.error("Error in transcribe_stream: %s", e)
+        return jsonify({'error': str(e)}), 500
         
-        # Add new feedback
-        data["feedback"].append(feedback_entry)
+    sse = request.values.get('format') == 'sse'
+    
+    def message(payload):
+        line = json.dumps(payload, ensure_ascii=False)
+        return f"data: {line}\n\n" if sse else line + "\n"
         
-        # Save updated feedback
-        with open(FEEDBACK_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
-            
-        # Also log to text file
-        with open(FEEDBACK_LOG, 'a', encoding='utf-8') as f:
-            f.write(f'[{timestamp}] Original: "{original}" -> Correction: "{correction}"\n')
+    def generate():
+        yield message({'job_id': job['job_id'], 'language': language, 'duration': duration, 'offset': offset})
+        index = get_sign_index()
+        try:
+            for segment in stream_file(job['path'], model, start=offset):
+                segment['signs'] = align_signs(segment['words'], index, language) if index else []
+                segment['video_paths'] = text_to_sign(segment['text'], language, index=index)
+                yield message(segment)
+                # Only reached once the segment has been handed to the client
+                transcription_jobs.save_progress(job, segment['offset'])
+            transcription_jobs.finish(job)
+            yield message({'done': True, 'job_id': job['job_id']})
+        except Exception as e:
+            logger.error("Error transcribing job %s: %s", job['job_id'], e)
+            yield message({'error': str(e), 'job_id': job['job_id'], 'offset': job['offset']})
             
-        return True
-    except Exception as e:
-        print(f"Error saving feedback: {e}")
-        return False
+    return Response(
+        generate(),
+        mimetype='text/event-stream' if sse else 'application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def save_feedback(original, correction, language=None):
+    """Queue feedback for the background writer; False if the queue is full"""
+    entry = FeedbackStore.new_entry(original, correction, language=language, source='app')
+    return feedback_writer.submit(entry)
 
 @app.route('/feedback', methods=['POST'])
 def handle_feedback():
@@ -373,27 +608,148 @@ def handle_feedback():
         if not original or not correction:
             return jsonify({"status": False, "error": "Missing required fields"})
             
-        if save_feedback(original, correction):
+        if save_feedback(original, correction, data.get('language')):
             return jsonify({"status": True})
         else:
-            return jsonify({"status": False, "error": "Failed to save feedback"})
+            return jsonify({"status": False, "error": "Feedback queue is full, try again later"}), 503
             
     except Exception as e:
         return jsonify({"status": False, "error": str(e)})
 
+@app.route('/feedback/stats', methods=['GET'])
+def feedback_stats():
+    """Feedback totals (read incrementally from the shared store file) and writer queue state"""
+    return jsonify(feedback_writer.stats())
+
+# Reviewers approve feedback with this token (X-Review-Token header); without
+# it set, the review endpoints are disabled and no correction is ever applied
+FEEDBACK_REVIEW_TOKEN = os.environ.get('FEEDBACK_REVIEW_TOKEN', '')
+
+def is_reviewer():
+    token = request.headers.get('X-Review-Token', '')
+    return bool(FEEDBACK_REVIEW_TOKEN) and hmac.compare_digest(token, FEEDBACK_REVIEW_TOKEN)
+
+@app.route('/feedback/pending', methods=['GET'])
+def pending_feedback():
+    """Feedback not yet reviewed, oldest first"""
+    if not is_reviewer():
+        return jsonify({"status": False, "error": "Review token required"}), 403
+    limit = request.args.get('limit', 100, type=int)
+    pending = []
+    for entry in feedback_store.read():
+        if not entry.get('processed'):
+            pending.append(entry)
+            if len(pending) >= limit:
+                break
+    return jsonify({"status": True, "entries": pending})
+
+@app.route('/feedback/review', methods=['POST'])
+def review_feedback():
+    """Mark feedback entries processed; their corrections are applied to the sign index"""
+    if not is_reviewer():
+        return jsonify({"status": False, "error": "Review token required"}), 403
+    try:
+        ids = (request.get_json(silent=True) or {}).get('ids') or []
+        if not isinstance(ids, list):
+            return jsonify({"status": False, "error": "ids must be a list"}), 400
+        changed = feedback_writer.mark_processed(str(entry_id) for entry_id in ids)
+        return jsonify({"status": True, "processed": [entry['id'] for entry in changed]})
+    except Exception as e:
+        logger.error("Error in review_feedback: %s", e)
+        return jsonify({"status": False, "error": str(e)}), 500
+
+# Media folders served under /media/. All of them are hot-reloaded, so their
+# files are revalidated unless requested as /media/<path>?v=<etag>
+MEDIA_FOLDERS = {
+    'alphabetimages': ALPHABET_IMAGES_PATH,
+    'indianalphabetsandnumbers': INDIAN_ALPHABET_IMAGES_PATH,
+    'mp4videos': VIDEOS_PATH,
+    'uploads': UPLOADS_PATH
+}
+# Translations link each file by its version (media_urls); a changed folder
+# gets new versions
+media_versions = MediaVersions(MEDIA_FOLDERS)
+MEDIA_CHANGE_LISTENERS.append(media_versions.invalidate)
+
 @app.route('/media/<path:filename>')
 def serve_media(filename):
-    # First try alphabetimages
-    if filename.startswith('alphabetimages/'):
-        return send_from_directory(ALPHABET_IMAGES_PATH, filename.replace('alphabetimages/', ''))
-    # Then try indianalphabetsandnumbers
-    elif filename.startswith('indianalphabetsandnumbers/'):
-        return send_from_directory(INDIAN_ALPHABET_IMAGES_PATH, filename.replace('indianalphabetsandnumbers/', ''))
-    # Finally try mp4videos
-    elif filename.startswith('mp4videos/'):
-        return send_from_directory(VIDEOS_PATH, filename.replace('mp4videos/', ''))
-    else:
+    """Sign media with strong ETags, 304 revalidation and byte ranges for seeking"""
+    folder, _, name = filename.partition('/')
+    if folder not in MEDIA_FOLDERS or not name:
         return "File not found", 404
+    # User uploaded signs must have an allowed extension
+    if folder == 'uploads' and not allowed_file(name):
+        return "File not found", 404
+        
+    return send_media(MEDIA_FOLDERS[folder], name)
+
+@app.route('/render_playlist', methods=['POST'])
+def render_playlist():
+    """Render a translation into a single fragmented MP4 instead of one request per clip.
+    
+    Body: {"text": "...", "language": "asl"} or {"video_paths": [...]}.
+    Returns the URL of the rendered video, which is cached by content.
+    """
+    if not FFMPEG_AVAILABLE:
+        return jsonify({'error': 'Rendering is not available (ffmpeg is not installed)'}), 501
+        
+    try:
+        data = request.get_json(silent=True) or {}
+        video_paths = data.get('video_paths')
+        if not video_paths:
+            text = data.get('text', '')
+            language = data.get('language', 'asl')
+            if not text:
+                return jsonify({'error': 'No text or video_paths provided'}), 400
+            translation = translator.translate(text, language)
+            video_paths = text_to_sign(translation['signs'], language)
+            
+        path, cached = clip_renderer.render(video_paths)
+        return jsonify({
+            'url': f"/rendered/{os.path.basename(path)}",
+            'video_paths': video_paths,
+            'cached': cached
+        })
+        
+    except RenderError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error("Error in render_playlist: %s", e)
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/rendered/<name>')
+def serve_rendered(name):
+    # Rendered videos are named by a hash of their content, so they never change
+    return send_media(RENDERED_PATH, name, immutable=True)
+
+@app.route('/bundle/<name>.json')
+def bundle_index(name):
+    """Offset index of an alphabet bundle: file name -> offset, length and type"""
+    bundle = alphabet_bundles.get(name)
+    if bundle is None:
+        return jsonify({'error': 'Unknown bundle'}), 404
+    response = jsonify(bundle.index())
+    response.cache_control.no_cache = True
+    response.set_etag(bundle.version)
+    return response.make_conditional(request)
+
+@app.route('/bundle/<name>.bin')
+def bundle_data(name):
+    """All images of an alphabet in one file; immutable when requested by version"""
+    bundle = alphabet_bundles.get(name)
+    if bundle is None:
+        return "File not found", 404
+    response = Response(bundle.data, mimetype='application/octet-stream')
+    response.set_etag(bundle.version)
+    if request.args.get('v') == bundle.version:
+        response.cache_control.public = True
+        response.cache_control.max_age = 365 * 24 * 3600
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response.make_conditional(request, accept_ranges=True, complete_length=len(bundle.data))
+
+startup_timer.ready()
 
 def check_model_setup():
     """Check if models are properly set up before starting the server"""
@@ -427,8 +783,16 @@ def get_ip():
 
     host = get_ip()
     port = 5001
+    ws_port = int(os.environ.get('AUDIO_WS_PORT', port + 1))
     print(f"\nAccess your app at:")
     print(f"Local URL: http://{host}:{port}")
+    print(f"Audio WebSocket: ws://{host}:{ws_port}/?language=asl")
+    
+    # Only start the socket server in the process that serves requests, not in
+    # the debug reloader's watcher process
+    if SERVING_PROCESS:
+        start_audio_socket_server(recognizer_pool, decode_pool, index=get_sign_index,
+                                  expressions=utterance_expressions, port=ws_port)
     
     app.run(
         host='0.0.0.0',  # Makes the server accessible from other devices
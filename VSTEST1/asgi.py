@@ -0,0 +1,348 @@
+"""ASGI entry point for serving many concurrent caption streams.
+
+Run with any ASGI server, e.g. ``uvicorn asgi:application --port 5001``.
+
+Streaming endpoints are handled natively on the event loop. Each needs a
+session issued by the Flask app (the session_id cookie set by /select_language,
+or the same id as an X-Session-Id header or session_id parameter); requests
+without one are rejected with 403 (WebSocket close 1008).
+  GET  /start_stream?session_id=&language=  SSE captions from the server microphone
+  GET  /captions?session_id=                SSE captions of an existing session
+  POST /stop_stream                         stop a session's microphone capture
+  WS   /ws/audio?session_id=&language=      client-pushed PCM audio, events echoed back
+                                            and fanned out to the session's listeners
+Every other route is passed through to the Flask app (needs asgiref installed).
+"""
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from http.cookies import SimpleCookie
+from urllib.parse import parse_qs
+
+import app as flask_app
+from audio_stream import RecognitionStream
+from structured_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Bridge the regular Flask routes if asgiref is available
+try:
+    from asgiref.wsgi import WsgiToAsgi
+    wsgi_application = WsgiToAsgi(flask_app.app)
+except ImportError:
+    wsgi_application = None
+
+# Blocking microphone reads and recognizer checkout run here, never on the
+# loop; decoding itself runs on the app's shared DecodePool
+executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('ASGI_IO_WORKERS', 32)),
+    thread_name_prefix='asgi-io'
+)
+
+# Events buffered per listener before the oldest are dropped
+LISTENER_QUEUE_SIZE = 256
+# Comment line sent to idle SSE listeners so proxies keep the connection open
+KEEPALIVE_INTERVAL = 15.0
+
+SSE_HEADERS = [
+    (b'content-type', b'text/event-stream'),
+    (b'cache-control', b'no-cache'),
+    (b'x-accel-buffering', b'no'),
+    (b'access-control-allow-origin', b'*'),
+]
+
+
+class CaptionHub:
+    """Fans each session's recognition events out to any number of listeners.
+
+    Publishing never blocks: a listener that falls behind loses its oldest
+    events instead of slowing the stream or the other listeners down.
+    """
+
+    def __init__(self):
+        self._listeners = {}
+
+    def subscribe(self, session_id):
+        queue = asyncio.Queue(maxsize=LISTENER_QUEUE_SIZE)
+        self._listeners.setdefault(session_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, session_id, queue):
+        listeners = self._listeners.get(session_id)
+        if listeners is not None:
+            listeners.discard(queue)
+            if not listeners:
+                del self._listeners[session_id]
+
+    def listener_count(self, session_id):
+        return len(self._listeners.get(session_id, ()))
+
+    def publish(self, session_id, event):
+        message = f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode('utf-8')
+        for queue in self._listeners.get(session_id, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(message)
+
+
+hub = CaptionHub()
+microphone_tasks = {}
+
+
+def publish_all(session_id, events):
+    for event in events or ():
+        hub.publish(session_id, event)
+
+
+async def capture_microphone(session_id, language):
+    """Recognition loop for the server microphone, run as an asyncio task"""
+    loop = asyncio.get_running_loop()
+    pool = flask_app.recognizer_pool
+
+    try:
+        recognizer = await loop.run_in_executor(executor, pool.acquire, language)
+    except Exception as e:
+        hub.publish(session_id, {'error': f'Speech model unavailable: {e}'})
+        return
+
+    audio = None
+    stream = None
+    decoder = flask_app.decode_pool.open(
+        RecognitionStream(recognizer, language, index=flask_app.get_sign_index,
+                          expressions=flask_app.utterance_expressions),
+        lambda events: loop.call_soon_threadsafe(publish_all, session_id, events)
+    )
+    try:
+        audio, stream = await loop.run_in_executor(executor, flask_app.open_microphone)
+        while hub.listener_count(session_id):
+            data = await loop.run_in_executor(executor, stream.read, flask_app.CHUNK_SIZE, False)
+            decoder.submit(data)
+    except asyncio.CancelledError:
+        pass
+    except Exception as e:
+        logger.warning("Error in microphone capture for %s: %s", session_id, e)
+        hub.publish(session_id, {'error': str(e)})
+    finally:
+        if stream:
+            stream.stop_stream()
+            stream.close()
+        if audio:
+            audio.terminate()
+        await loop.run_in_executor(executor, flask_app.decode_pool.close, decoder)
+        pool.release(language, recognizer)
+        microphone_tasks.pop(session_id, None)
+
+
+def _query(scope):
+    params = parse_qs(scope.get('query_string', b'').decode('utf-8'))
+    return {key: values[0] for key, values in params.items()}
+
+
+def _issued_session(scope, data=None):
+    """The Flask session named by the request, or None if the server never issued it"""
+    headers = dict(scope.get('headers') or [])
+    cookie = SimpleCookie(headers.get(b'cookie', b'').decode('latin-1'))
+    session_id = (cookie[flask_app.SESSION_COOKIE].value if flask_app.SESSION_COOKIE in cookie else None)
+    session_id = (session_id or headers.get(b'x-session-id', b'').decode('latin-1')
+                  or (data or {}).get('session_id') or _query(scope).get('session_id'))
+    return flask_app.sessions.get(session_id) if isinstance(session_id, str) else None
+
+
+async def _read_body(receive):
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            return body
+
+
+async def _send_json(send, payload, status=200):
+    body = json.dumps(payload).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'), (b'access-control-allow-origin', b'*')]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def _wait_for_disconnect(receive):
+    """Consume request messages until the client goes away"""
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return
+
+
+async def serve_captions(scope, receive, send, session_id):
+    """Stream a session's events as SSE until the client disconnects"""
+    queue = hub.subscribe(session_id)
+    await send({'type': 'http.response.start', 'status': 200, 'headers': SSE_HEADERS})
+
+    disconnected = asyncio.ensure_future(_wait_for_disconnect(receive))
+    try:
+        while True:
+            next_event = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait(
+                {next_event, disconnected},
+                timeout=KEEPALIVE_INTERVAL,
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            if disconnected in done:
+                next_event.cancel()
+                break
+            if next_event in done:
+                body = next_event.result()
+            else:
+                next_event.cancel()
+                body = b': keepalive\n\n'
+            await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+    finally:
+        client_gone = disconnected.done() and not disconnected.cancelled()
+        disconnected.cancel()
+        hub.unsubscribe(session_id, queue)
+        if not client_gone:
+            # Ended from our side (shutdown, error): complete the response
+            try:
+                await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+            except Exception:
+                pass
+
+
+async def start_stream(scope, receive, send):
+    params = _query(scope)
+    session = _issued_session(scope)
+    if session is None:
+        await _send_json(send, {'error': 'Unknown session; call /select_language first'}, status=403)
+        return
+    session_id = session.session_id
+    language = (params.get('language') or session.language or '').lower()
+    if not language:
+        await _send_json(send, {'error': 'Please select a language first'}, status=400)
+        return
+
+    # Subscribe before the capture task checks for listeners
+    serving = asyncio.ensure_future(serve_captions(scope, receive, send, session_id))
+    await asyncio.sleep(0)
+    if session_id not in microphone_tasks:
+        microphone_tasks[session_id] = asyncio.ensure_future(capture_microphone(session_id, language))
+    await serving
+
+
+async def stop_stream(scope, receive, send):
+    body = await _read_body(receive)
+    try:
+        data = json.loads(body) if body else {}
+    except ValueError:
+        data = {}
+    session = _issued_session(scope, data if isinstance(data, dict) else None)
+    if session is None:
+        await _send_json(send, {'error': 'Unknown session'}, status=403)
+        return
+
+    task = microphone_tasks.pop(session.session_id, None)
+    if task:
+        task.cancel()
+    await _send_json(send, {'status': 'stopped'})
+
+
+async def audio_socket(scope, receive, send):
+    """Client-pushed audio: decode each frame and publish the events to the session"""
+    loop = asyncio.get_running_loop()
+    params = _query(scope)
+    session = _issued_session(scope)
+    language = (params.get('language') or (session.language if session else '') or 'asl').lower()
+
+    message = await receive()
+    if message['type'] != 'websocket.connect':
+        return
+    if session is None:
+        await send({'type': 'websocket.close', 'code': 1008, 'reason': 'Unknown session'})
+        return
+    session_id = session.session_id
+    try:
+        recognizer = await loop.run_in_executor(executor, flask_app.recognizer_pool.acquire, language)
+    except Exception as e:
+        await send({'type': 'websocket.close', 'code': 1011, 'reason': f'Speech model unavailable: {e}'})
+        return
+
+    await send({'type': 'websocket.accept'})
+    outbox = asyncio.Queue()
+    decoder = flask_app.decode_pool.open(
+        RecognitionStream(recognizer, language, index=flask_app.get_sign_index,
+                          expressions=flask_app.utterance_expressions),
+        lambda events: loop.call_soon_threadsafe(outbox.put_nowait, events)
+    )
+
+    async def forward():
+        while True:
+            events = await outbox.get()
+            if events is None:
+                return
+            publish_all(session_id, events)
+            for event in events:
+                await send({'type': 'websocket.send', 'text': json.dumps(event, ensure_ascii=False)})
+
+    sender = asyncio.ensure_future(forward())
+    try:
+        while True:
+            message = await receive()
+            if message['type'] == 'websocket.disconnect':
+                break
+            if message.get('bytes'):
+                decoder.submit(message['bytes'])
+            elif message.get('text'):
+                try:
+                    command = json.loads(message['text'])
+                except ValueError:
+                    continue
+                if isinstance(command, dict) and command.get('event') == 'stop':
+                    decoder.finish()
+                    await sender
+                    await send({'type': 'websocket.close', 'code': 1000})
+                    break
+    finally:
+        sender.cancel()
+        await loop.run_in_executor(executor, flask_app.decode_pool.close, decoder)
+        flask_app.recognizer_pool.release(language, recognizer)
+
+
+async def not_found(scope, receive, send):
+    await _send_json(send, {'error': 'Not found'}, status=404)
+
+
+ROUTES = {
+    ('http', 'GET', '/start_stream'): start_stream,
+    ('http', 'POST', '/stop_stream'): stop_stream,
+    ('websocket', None, '/ws/audio'): audio_socket,
+}
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                for task in list(microphone_tasks.values()):
+                    task.cancel()
+                executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    path = scope.get('path', '/')
+    if scope['type'] == 'http' and scope['method'] == 'GET' and path == '/captions':
+        session = _issued_session(scope)
+        if session is None:
+            await _send_json(send, {'error': 'Unknown session'}, status=403)
+        else:
+            await serve_captions(scope, receive, send, session.session_id)
+        return
+
+    handler = ROUTES.get((scope['type'], scope.get('method'), path))
+    if handler is None and wsgi_application is not None and scope['type'] == 'http':
+        handler = wsgi_application
+    await (handler or not_found)(scope, receive, send)
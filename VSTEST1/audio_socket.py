@@ -0,0 +1,144 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlparse
+
+from audio_stream import RecognitionStream
+from structured_logging import get_logger
+
+logger = get_logger(__name__)
+
+# websockets is optional; without it clients fall back to the SSE endpoints
+WEBSOCKETS_AVAILABLE = False
+try:
+    from websockets.asyncio.server import serve
+    from websockets.exceptions import ConnectionClosed
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    serve = None
+    ConnectionClosed = Exception
+
+# Largest single audio message accepted (about 4 s of 16 kHz 16-bit mono PCM)
+MAX_MESSAGE_SIZE = 128 * 1024
+
+
+class AudioSocketServer:
+    """WebSocket endpoint for client-pushed audio.
+
+    Protocol, per connection:
+      - the language comes from the ?language= query parameter or a first text
+        message {"language": "asl"};
+      - binary messages are 16 kHz mono 16-bit PCM frames;
+      - a text message {"event": "stop"} flushes the final result and closes.
+    Every recognition event is sent back as one JSON text message, including
+    the sign events that resolve committed words to their media.
+
+    Each connection gets its own recognizer from the pool; decoding runs on the
+    shared DecodePool so the event loop only moves bytes.
+    """
+
+    def __init__(self, recognizer_pool, decode_pool, index=None, expressions=None, host='0.0.0.0', port=5002):
+        self.recognizer_pool = recognizer_pool
+        self.decode_pool = decode_pool
+        self.index = index
+        self.expressions = expressions
+        self.host = host
+        self.port = port
+        # Recognizer checkout and teardown may block on model loading or a decode
+        self.executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='ws-io')
+        self.connections = 0
+
+    async def _send(self, websocket, events):
+        for event in events:
+            await websocket.send(json.dumps(event, ensure_ascii=False))
+
+    async def _forward(self, websocket, outbox):
+        """Send decoded events until the decoder signals the end of the stream"""
+        while True:
+            events = await outbox.get()
+            if events is None:
+                return
+            await self._send(websocket, events)
+
+    async def _read_language(self, websocket):
+        query = parse_qs(urlparse(websocket.request.path).query)
+        if query.get('language'):
+            return query['language'][0].lower()
+
+        message = await websocket.recv()
+        if isinstance(message, bytes):
+            return None
+        try:
+            return (json.loads(message).get('language') or '').lower() or None
+        except (ValueError, AttributeError):
+            return None
+
+    async def handle(self, websocket):
+        loop = asyncio.get_running_loop()
+        language = await self._read_language(websocket)
+        if not language:
+            await self._send(websocket, [{'error': 'Please select a language first'}])
+            return
+
+        try:
+            recognizer = await loop.run_in_executor(self.executor, self.recognizer_pool.acquire, language)
+        except Exception as e:
+            await self._send(websocket, [{'error': f'Speech model unavailable: {e}'}])
+            return
+
+        self.connections += 1
+        outbox = asyncio.Queue()
+        decoder = self.decode_pool.open(
+            RecognitionStream(recognizer, language, index=self.index, expressions=self.expressions),
+            lambda events: loop.call_soon_threadsafe(outbox.put_nowait, events)
+        )
+        await self._send(websocket, [{'status': 'ready', 'language': language}])
+        sender = asyncio.ensure_future(self._forward(websocket, outbox))
+        try:
+            async for message in websocket:
+                if isinstance(message, bytes):
+                    decoder.submit(message)
+                    continue
+
+                try:
+                    command = json.loads(message)
+                except ValueError:
+                    continue
+                if isinstance(command, dict) and command.get('event') == 'stop':
+                    decoder.finish()
+                    await sender
+                    await self._send(websocket, [{'status': 'stopped'}])
+                    break
+        except ConnectionClosed:
+            pass
+        except Exception as e:
+            logger.warning("Error in audio socket for %s: %s", language, e)
+        finally:
+            sender.cancel()
+            self.connections -= 1
+            await loop.run_in_executor(self.executor, self.decode_pool.close, decoder)
+            self.recognizer_pool.release(language, recognizer)
+
+    async def serve_forever(self):
+        async with serve(self.handle, self.host, self.port, max_size=MAX_MESSAGE_SIZE) as server:
+            logger.info("Audio WebSocket listening on ws://%s:%s", self.host, self.port)
+            await server.serve_forever()
+
+
+def start_audio_socket_server(recognizer_pool, decode_pool, index=None, expressions=None,
+                              host='0.0.0.0', port=5002):
+    """Run the audio WebSocket server on its own event loop in a daemon thread"""
+    if not WEBSOCKETS_AVAILABLE:
+        logger.warning("websockets is not installed; audio WebSocket endpoint disabled")
+        return None
+
+    server = AudioSocketServer(recognizer_pool, decode_pool, index=index, expressions=expressions,
+                               host=host, port=port)
+    thread = threading.Thread(
+        target=lambda: asyncio.run(server.serve_forever()),
+        name='audio-socket',
+        daemon=True
+    )
+    thread.start()
+    return server
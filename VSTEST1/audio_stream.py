@@ -0,0 +1,222 @@
+import json
+
+from structured_logging import SAMPLED, get_logger
+
+logger = get_logger(__name__)
+
+
+def _word_times(result, key, words):
+    """Vosk's per-word results under key, if there is one for every word"""
+    times = result.get(key)
+    return times if times and len(times) == len(words) else None
+
+
+def _committed_word(offset, word, timing):
+    committed = {'text': word, 'offset': offset}
+    if timing:
+        committed['start'] = timing['start']
+        committed['end'] = timing['end']
+    return committed
+
+
+def _common_prefix(a, b):
+    """Number of leading words two hypotheses share"""
+    n = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        n += 1
+    return n
+
+
+class HypothesisTracker:
+    """Turns successive recognizer hypotheses into committed words and partial deltas.
+
+    A word is committed once it has kept its position across two consecutive
+    partial hypotheses and is no longer the last word, which may still be
+    growing; a final result commits whatever remains of the utterance.
+    Committed words are never retracted and are numbered by their offset in
+    the whole stream, so repeated words are kept.
+    """
+
+    def __init__(self):
+        self.base = 0        # Stream offset of the current utterance's first word
+        self.committed = []  # Committed words of the current utterance
+        self.previous = []   # Last partial hypothesis
+        self.sent = []       # Partial words the client currently shows
+
+    def _commit(self, words, upto, times):
+        start = len(self.committed)
+        if upto <= start:
+            return []
+        self.committed.extend(words[start:upto])
+        return [_committed_word(self.base + i, words[i], times[i] if times else None)
+                for i in range(start, upto)]
+
+    def partial(self, words, times=None):
+        """Return (newly committed words, partial delta or None).
+
+        times, if known, holds one Vosk word result per word; committed words
+        are dicts {'text', 'offset'} plus 'start' and 'end' in seconds.
+        """
+        stable = min(_common_prefix(words, self.previous), len(words) - 1)
+        committed = self._commit(words, stable, times)
+        self.previous = words
+
+        delta = None
+        start = _common_prefix(words, self.sent)
+        if start < len(words) or start < len(self.sent):
+            delta = {'offset': start, 'words': words[start:]}
+            self.sent = words
+        return committed, delta
+
+    def final(self, words, times=None):
+        """Commit the rest of a finished utterance and start the next one"""
+        committed = self._commit(words, len(words), times)
+        self.base += len(self.committed)
+        self.committed = []
+        self.previous = []
+        self.sent = []
+        return committed
+
+
+class SignSegmenter:
+    """Groups committed words into the longest phrases that have their own sign.
+
+    A word that could still start a multi-word phrase is held back until the
+    words after it decide the match, or until the utterance ends.
+    """
+
+    def __init__(self):
+        self.pending = []  # Committed words not yet grouped
+
+    def push(self, committed, phrases, final=False):
+        """Add committed words; return the groups that are now decided.
+
+        Each group is {'word', 'offset'} plus, when the words were timed,
+        'start' of its first word and 'end' of its last.
+        """
+        self.pending.extend(committed)
+        groups = []
+        while self.pending:
+            words = [word['text'] for word in self.pending]
+            if not final and phrases.extends(words):
+                break
+            length = max(phrases.longest_match(words), 1)
+            first, last = self.pending[0], self.pending[length - 1]
+            group = {'word': ' '.join(words[:length]), 'offset': first['offset']}
+            if 'start' in first and 'end' in last:
+                group['start'] = first['start']
+                group['end'] = last['end']
+            groups.append(group)
+            del self.pending[:length]
+        return groups
+
+
+def align_signs(words, index, language='asl'):
+    """Align a timed transcript with its sign clips.
+
+    words are Vosk word results ({'word', 'start', 'end', ...}), e.g. the
+    'result' list of a final result. Returns one entry per sign segment:
+    {'word', 'offset', 'start', 'end', 'media_paths'}, so a player can
+    schedule each clip against the speech instead of after it.
+    """
+    committed = [_committed_word(i, word['word'], word) for i, word in enumerate(words)]
+    segments = SignSegmenter().push(committed, index.phrases(language), final=True)
+    for segment in segments:
+        segment['media_paths'] = list(index.resolve(segment['word'], language))
+    return segments
+
+
+class RecognitionStream:
+    """Feeds raw 16-bit PCM chunks to one recognizer and turns its results into events.
+
+    Every call to feed() returns the list of events (plain dicts) produced by that
+    chunk:
+      {'text', 'language', 'is_word', 'offset',   a newly committed word, its position
+       'start', 'end'}                            in the stream and its time in seconds
+      {'partial_delta': {'offset', 'words'}}      the running hypothesis changed from
+                                                  word `offset` of the utterance on
+      {'word', 'offset', 'start', 'end',          a committed word or phrase resolved to
+       'language', 'media_paths', 'expressions'}  its sign clips or fingerspelling
+      {'text', 'is_full', 'expressions'}          a finished utterance; the partial
+                                                  hypothesis starts over empty
+
+    Sign events are only produced when index is given: a callable returning the
+    current SignIndex. expressions(text, language), if given, supplies the
+    non-manual markers of each sign segment (from its own words, as soon as it
+    is decided) and of each finished utterance; without it sign events have no
+    'expressions' field.
+    Times are only present when the recognizer reports word times (see
+    recognizer_pool.new_recognizer) and count from the start of the stream.
+    """
+
+    def __init__(self, recognizer, language, index=None, expressions=None):
+        self.recognizer = recognizer
+        self.language = language
+        self.index = index
+        self.expressions = expressions
+        self.tracker = HypothesisTracker()
+        self.segmenter = SignSegmenter()
+        self._last_partial = None
+
+    def _word_events(self, committed, final=False):
+        events = []
+        for word in committed:
+            logger.debug("New word recognized: %s", word['text'], extra=SAMPLED)
+            events.append(dict(word, language=self.language, is_word=True))
+
+        index = self.index() if self.index else None
+        if index is None:
+            return events
+        for group in self.segmenter.push(committed, index.phrases(self.language), final):
+            group.update(
+                language=self.language,
+                media_paths=list(index.resolve(group['word'], self.language))
+            )
+            if self.expressions:
+                group['expressions'] = self._expressions(group['word'])
+            events.append(group)
+        return events
+
+    def feed(self, data):
+        """Process one chunk of audio and return the resulting events"""
+        if self.recognizer.AcceptWaveform(data):
+            return self._final(self.recognizer.Result())
+
+        # The hypothesis usually does not change between chunks; skip parsing it then
+        partial = self.recognizer.PartialResult()
+        if partial == self._last_partial:
+            return []
+        self._last_partial = partial
+
+        result = json.loads(partial)
+        words = result.get('partial', '').split()
+        committed, delta = self.tracker.partial(words, _word_times(result, 'partial_result', words))
+        events = self._word_events(committed)
+        if delta:
+            events.append({'partial_delta': delta})
+        return events
+
+    def finish(self):
+        """Flush the recognizer at the end of the audio and return the last events"""
+        return self._final(self.recognizer.FinalResult())
+
+    def _final(self, result):
+        self._last_partial = None
+        result = json.loads(result)
+        text = result.get('text', '').strip()
+        words = text.split()
+        events = self._word_events(self.tracker.final(words, _word_times(result, 'result', words)), final=True)
+        if text:
+            events.append({'text': text, 'is_full': True, 'expressions': self._expressions(text)})
+        return events
+
+    def _expressions(self, text):
+        if not self.expressions:
+            return []
+        try:
+            return self.expressions(text, self.language)
+        except Exception as e:
+            logger.warning("Error generating expressions: %s", e)
+            return []
@@ -0,0 +1,161 @@
+import hashlib
+import os
+import shutil
+import subprocess
+import threading
+
+# ffmpeg is optional; without it the browser keeps playing clips one by one
+FFMPEG_PATH = shutil.which('ffmpeg')
+FFMPEG_AVAILABLE = FFMPEG_PATH is not None
+
+# Every clip is normalised to these parameters once, so whole playlists can
+# then be joined with stream copy instead of re-encoding
+RENDER_WIDTH = 640
+RENDER_HEIGHT = 480
+RENDER_FPS = 25
+# How long a letter image is shown in a rendered video
+STILL_SECONDS = 0.6
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+# Renders of the same key are serialised by one of these striped locks
+LOCK_STRIPES = 64
+
+_NORMALIZE_FILTER = (
+    f"scale={RENDER_WIDTH}:{RENDER_HEIGHT}:force_original_aspect_ratio=decrease,"
+    f"pad={RENDER_WIDTH}:{RENDER_HEIGHT}:(ow-iw)/2:(oh-ih)/2,"
+    f"fps={RENDER_FPS},format=yuv420p"
+)
+
+
+class RenderError(Exception):
+    pass
+
+
+class ClipRenderer:
+    """Stitches a sign playlist into one fragmented MP4 with ffmpeg.
+
+    media_roots maps the folder prefix used in playlist paths (e.g.
+    'mp4videos') to its directory. Each source clip or image is encoded once
+    into a normalised segment, cached by the clip's path, size and mtime;
+    a playlist is then joined from those segments with stream copy and
+    cached by a hash of its segments, so repeated sentences are served from
+    disk. The cache is trimmed to max_bytes, least recently used first.
+    """
+
+    def __init__(self, media_roots, cache_dir, max_bytes=512 * 1024 * 1024, timeout=120):
+        self.media_roots = media_roots
+        self.cache_dir = cache_dir
+        self.segment_dir = os.path.join(cache_dir, 'segments')
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        self.renders = 0
+        self.hits = 0
+        os.makedirs(self.segment_dir, exist_ok=True)
+
+    def _source(self, media_path):
+        """Absolute file for a playlist entry, refusing anything outside the media roots"""
+        folder, _, name = media_path.partition('/')
+        root = self.media_roots.get(folder)
+        if root is None or not name:
+            raise RenderError(f"Unknown media path: {media_path}")
+        root = os.path.realpath(root)
+        path = os.path.realpath(os.path.join(root, name))
+        if os.path.commonpath([root, path]) != root or not os.path.isfile(path):
+            raise RenderError(f"Media file not found: {media_path}")
+        return path
+
+    def _key_lock(self, key):
+        return self._locks[int(key[:8], 16) % LOCK_STRIPES]
+
+    def _run(self, args):
+        try:
+            subprocess.run([FFMPEG_PATH, '-y', '-loglevel', 'error'] + args,
+                           check=True, capture_output=True, timeout=self.timeout)
+        except subprocess.CalledProcessError as e:
+            raise RenderError(e.stderr.decode('utf-8', 'replace').strip()[-500:])
+        except subprocess.TimeoutExpired:
+            raise RenderError("ffmpeg timed out")
+
+    def _segment(self, source):
+        """Normalised segment for one source file, encoding it on first use"""
+        stat = os.stat(source)
+        key = hashlib.sha256(f"{source}|{stat.st_size}|{stat.st_mtime_ns}".encode('utf-8')).hexdigest()
+        path = os.path.join(self.segment_dir, key + '.mp4')
+
+        with self._key_lock(key):
+            if os.path.exists(path):
+                os.utime(path)
+                return key, path
+            if source.lower().endswith(IMAGE_EXTENSIONS):
+                inputs = ['-loop', '1', '-t', str(STILL_SECONDS), '-i', source]
+            else:
+                inputs = ['-i', source]
+            tmp = path + '.tmp.mp4'
+            self._run(inputs + ['-an', '-vf', _NORMALIZE_FILTER, '-c:v', 'libx264',
+                                '-preset', 'veryfast', '-video_track_timescale', '12800', tmp])
+            os.replace(tmp, path)
+        return key, path
+
+    def render(self, playlist):
+        """Return (path, cached) of the fragmented MP4 for a playlist of media paths"""
+        if not FFMPEG_AVAILABLE:
+            raise RenderError("ffmpeg is not installed")
+        if not playlist:
+            raise RenderError("Empty playlist")
+
+        segments = [self._segment(self._source(media_path)) for media_path in playlist]
+        key = hashlib.sha256('\n'.join(segment_key for segment_key, _ in segments).encode('utf-8')).hexdigest()
+        path = os.path.join(self.cache_dir, key + '.mp4')
+
+        with self._key_lock(key):
+            if os.path.exists(path):
+                os.utime(path)  # Mark as recently used
+                self.hits += 1
+                return path, True
+
+            list_path = path + '.txt'
+            with open(list_path, 'w', encoding='utf-8') as f:
+                for _, segment_path in segments:
+                    f.write(f"file '{segment_path}'\n")
+            tmp = path + '.tmp.mp4'
+            try:
+                self._run(['-f', 'concat', '-safe', '0', '-i', list_path, '-c', 'copy',
+                           '-movflags', '+frag_keyframe+empty_moov+default_base_moof', tmp])
+                os.replace(tmp, path)
+            finally:
+                os.remove(list_path)
+            self.renders += 1
+
+        self._trim()
+        return path, False
+
+    def _trim(self):
+        entries = []
+        for directory in (self.cache_dir, self.segment_dir):
+            for name in os.listdir(directory):
+                if name.endswith('.mp4') and '.tmp' not in name:
+                    full = os.path.join(directory, name)
+                    try:
+                        stat = os.stat(full)
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, full))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, full in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(full)
+                total -= size
+            except OSError:
+                pass
+
+    def stats(self):
+        return {
+            'available': FFMPEG_AVAILABLE,
+            'renders': self.renders,
+            'hits': self.hits
+        }
@@ -0,0 +1,205 @@
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+from structured_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Chunks a stream may have waiting before its oldest audio is dropped
+# (32 chunks of 1024 frames is about 2 s of 16 kHz audio)
+MAX_PENDING_CHUNKS = 32
+
+
+class DecodeStream:
+    """One audio stream registered with a DecodePool.
+
+    submit() and finish() only queue work and never block the caller. Events
+    produced by the stream's RecognitionStream are handed to on_events(events)
+    from a worker thread; after finish() has flushed the recognizer,
+    on_events(None) signals the end of the stream. It is sent even if
+    flushing failed, and at once if the stream is already closed.
+    """
+
+    def __init__(self, pool, recognition, on_events, max_pending):
+        self.pool = pool
+        self.recognition = recognition
+        self.on_events = on_events
+        self.max_pending = max_pending
+        self.closed = False
+        self.done = threading.Event()
+        self.dropped = 0
+        self.last_lag = 0.0
+        self._pending = deque()  # (enqueued_at, chunk); a None chunk asks for finish()
+        self._scheduled = False
+        self._ended = False
+
+    @property
+    def depth(self):
+        return len(self._pending)
+
+    def submit(self, data):
+        """Queue a chunk of audio for decoding"""
+        self.pool._submit(self, data)
+
+    def finish(self):
+        """Decode everything queued so far, then flush the final result"""
+        self.pool._submit(self, None)
+
+
+class DecodePool:
+    """Decoder threads shared by all live streams.
+
+    Each stream has a bounded queue of pending chunks and is decoded by at
+    most one worker at a time, so its chunks stay in order while a slow
+    stream never holds up the others. A worker takes everything a stream
+    has queued and decodes it in one AcceptWaveform call (coalescing); when
+    a stream falls more than max_pending chunks behind, its oldest audio is
+    dropped rather than letting latency grow without bound.
+    """
+
+    def __init__(self, workers=None, max_pending=MAX_PENDING_CHUNKS):
+        self.workers = workers or os.cpu_count() or 4
+        self.max_pending = max_pending
+        self._ready = queue.Queue()
+        self._streams = set()
+        self._lock = threading.Lock()
+        self.chunks = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.decodes = 0
+        self.decode_time = 0.0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+
+        for i in range(self.workers):
+            threading.Thread(target=self._run, name=f'decoder-{i}', daemon=True).start()
+
+    def open(self, recognition, on_events, max_pending=None):
+        """Register a RecognitionStream and return its DecodeStream handle"""
+        stream = DecodeStream(self, recognition, on_events, max_pending or self.max_pending)
+        with self._lock:
+            self._streams.add(stream)
+        return stream
+
+    def close(self, stream, timeout=5.0):
+        """Discard a stream's queued audio and wait for any decode in progress.
+
+        Once this returns the recognizer is no longer used and can be released.
+        """
+        with self._lock:
+            stream.closed = True
+            stream._pending.clear()
+            self._streams.discard(stream)
+            if not stream._scheduled:
+                stream.done.set()
+        stream.done.wait(timeout)
+
+    def _end(self, stream):
+        """Hand on_events(None) to the stream once, whether or not finishing succeeded"""
+        with self._lock:
+            if stream._ended:
+                return
+            stream._ended = True
+        try:
+            stream.on_events(None)
+        except Exception as e:
+            logger.exception("Error ending audio stream: %s", e)
+
+    def _submit(self, stream, data):
+        with self._lock:
+            closed = stream.closed
+            if not closed:
+                self._enqueue(stream, data)
+        # Nothing left to decode on a closed stream: a finish() waiter must not hang
+        if closed and data is None:
+            self._end(stream)
+
+    def _enqueue(self, stream, data):
+        """Queue work for a stream; called with the lock held"""
+        pending = stream._pending
+        if data is not None:
+            self.chunks += 1
+            # Drop the oldest audio, never a pending finish, once too far behind
+            while len(pending) >= stream.max_pending and pending[0][1] is not None:
+                pending.popleft()
+                stream.dropped += 1
+                self.dropped += 1
+        pending.append((time.monotonic(), data))
+        if not stream._scheduled:
+            stream._scheduled = True
+            self._ready.put(stream)
+
+    def _take(self, stream):
+        """Pop the next unit of work: a run of audio chunks, or the finish request"""
+        with self._lock:
+            pending = stream._pending
+            if stream.closed or not pending:
+                return None, None
+            if pending[0][1] is None:
+                return [pending.popleft()], True
+            batch = []
+            while pending and pending[0][1] is not None:
+                batch.append(pending.popleft())
+            return batch, False
+
+    def _run(self):
+        while True:
+            stream = self._ready.get()
+            batch, finishing = self._take(stream)
+
+            if batch:
+                started = time.monotonic()
+                try:
+                    if finishing:
+                        events = stream.recognition.finish()
+                    else:
+                        events = stream.recognition.feed(b''.join(chunk for _, chunk in batch))
+                    if events:
+                        stream.on_events(events)
+                except Exception as e:
+                    logger.exception("Error decoding audio: %s", e)
+                finally:
+                    if finishing:
+                        self._end(stream)
+                finished = time.monotonic()
+
+                lag = finished - batch[0][0]
+                stream.last_lag = lag
+                with self._lock:
+                    self.decodes += 1
+                    self.coalesced += len(batch) - 1
+                    self.decode_time += finished - started
+                    self.total_lag += lag
+                    self.max_lag = max(self.max_lag, lag)
+
+            with self._lock:
+                if finishing:
+                    stream.closed = True
+                    self._streams.discard(stream)
+                if stream._pending and not stream.closed:
+                    self._ready.put(stream)
+                else:
+                    stream._scheduled = False
+                    if stream.closed:
+                        stream.done.set()
+
+    def stats(self):
+        with self._lock:
+            depths = [stream.depth for stream in self._streams]
+            return {
+                'workers': self.workers,
+                'streams': len(self._streams),
+                'queued_chunks': sum(depths),
+                'max_queue_depth': max(depths, default=0),
+                'chunks': self.chunks,
+                'dropped_chunks': self.dropped,
+                'coalesced_chunks': self.coalesced,
+                'decodes': self.decodes,
+                'avg_decode_ms': round(1000 * self.decode_time / self.decodes, 2) if self.decodes else 0.0,
+                'avg_lag_ms': round(1000 * self.total_lag / self.decodes, 2) if self.decodes else 0.0,
+                'max_lag_ms': round(1000 * self.max_lag, 2),
+                'current_lag_ms': round(1000 * max((s.last_lag for s in self._streams), default=0.0), 2)
+            }
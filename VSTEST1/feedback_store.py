@@ -0,0 +1,268 @@
+import datetime
+import json
+import os
+import threading
+import time
+import uuid
+
+from structured_logging import get_logger
+
+logger = get_logger(__name__)
+
+# flock keeps writers in different processes from interleaving; not on Windows
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    fcntl = None
+    FCNTL_AVAILABLE = False
+
+
+class FeedbackStore:
+    """Append-only JSON Lines store for translation feedback.
+
+    Every entry is one line:
+      {"id", "timestamp", "original", "correction", "language", "source",
+       "context", "processed"}
+    Changes to an entry (marking it processed) are appended as
+    {"update": id, ...fields} lines and folded in by read(); compact()
+    rewrites the file with updates applied once there are enough of them.
+
+    Appends are O(1): one open handle, a thread lock and, where available, an
+    flock so several worker processes can share the file. fsync is batched:
+    at most once per fsync_interval seconds unless sync() is called.
+
+    counts() reports totals for the whole file, including what other processes
+    wrote: it only parses the lines appended since its last call, and starts
+    over when the file has been replaced by compact().
+    """
+
+    def __init__(self, path, legacy_path=None, fsync_interval=1.0, compact_threshold=1000):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.compact_threshold = compact_threshold
+        self._lock = threading.Lock()
+        self._file = None
+        self._last_sync = time.monotonic()
+        self._dirty = False
+        self._updates = 0
+        self._count_lock = threading.Lock()
+        self._count_inode = None
+        self._count_offset = 0
+        self._total = 0
+        self._processed_ids = set()
+        self._latest = None
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        if legacy_path and not os.path.exists(path) and os.path.exists(legacy_path):
+            self._migrate(legacy_path)
+
+    @staticmethod
+    def new_entry(original, correction, language=None, source=None, context=None):
+        return {
+            'id': uuid.uuid4().hex,
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'original': original,
+            'correction': correction,
+            'language': language,
+            'source': source,
+            'context': context,
+            'processed': False
+        }
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        return self._file
+
+    def _locked_file(self):
+        """The append handle, flocked, reopened if another process compacted the file"""
+        f = self._open()
+        if not FCNTL_AVAILABLE:
+            return f
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            current = os.stat(self.path).st_ino
+        except FileNotFoundError:
+            current = None
+        if current != os.fstat(f.fileno()).st_ino:
+            fcntl.flock(f, fcntl.LOCK_UN)
+            f.close()
+            self._file = None
+            f = self._open()
+            fcntl.flock(f, fcntl.LOCK_EX)
+        return f
+
+    def _write_lines(self, records, sync=False):
+        data = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+        with self._lock:
+            f = self._locked_file()
+            try:
+                f.write(data)
+                f.flush()
+                self._dirty = True
+                if sync or time.monotonic() - self._last_sync >= self.fsync_interval:
+                    os.fsync(f.fileno())
+                    self._last_sync = time.monotonic()
+                    self._dirty = False
+            finally:
+                if FCNTL_AVAILABLE:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def append(self, entry):
+        """Store one entry (see new_entry) and return it"""
+        self._write_lines([entry])
+        return entry
+
+    def append_many(self, entries, sync=False):
+        """Store several entries with a single write"""
+        if entries:
+            self._write_lines(entries, sync=sync)
+
+    def mark_processed(self, ids):
+        """Mark entries processed; returns the entries that were not processed before"""
+        wanted = set(ids)
+        if not wanted:
+            return []
+        changed = [entry for entry in self.read()
+                   if entry.get('id') in wanted and not entry.get('processed')]
+        if not changed:
+            return []
+        self._write_lines([{'update': entry['id'], 'processed': True} for entry in changed])
+        for entry in changed:
+            entry['processed'] = True
+        self._updates += len(changed)
+        if self._updates >= self.compact_threshold:
+            self.compact()
+        return changed
+
+    def counts(self):
+        """(total entries, processed entries, latest entry) of the shared file"""
+        with self._count_lock:
+            try:
+                f = open(self.path, 'rb')
+            except FileNotFoundError:
+                return 0, 0, None
+            with f:
+                info = os.fstat(f.fileno())
+                if info.st_ino != self._count_inode or info.st_size < self._count_offset:
+                    self._count_inode = info.st_ino
+                    self._count_offset = 0
+                    self._total = 0
+                    self._processed_ids = set()
+                    self._latest = None
+                f.seek(self._count_offset)
+                data = f.read(info.st_size - self._count_offset)
+
+            # Leave a partly written last line for the next call
+            data = data[:data.rfind(b'\n') + 1]
+            self._count_offset += len(data)
+            for line in data.splitlines():
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                # Counted by id: concurrent reviews may append the same update twice
+                if 'update' in record:
+                    if record.get('processed'):
+                        self._processed_ids.add(record['update'])
+                else:
+                    self._total += 1
+                    if record.get('processed'):
+                        self._processed_ids.add(record.get('id'))
+                    self._latest = record
+            return self._total, len(self._processed_ids), self._latest
+
+    def sync(self):
+        """fsync anything written since the last sync"""
+        with self._lock:
+            if self._file is not None and self._dirty:
+                os.fsync(self._file.fileno())
+                self._last_sync = time.monotonic()
+                self._dirty = False
+
+    def _records(self):
+        try:
+            f = open(self.path, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue  # Torn last line after a crash
+
+    def read(self):
+        """Stream entries in insertion order, with their updates applied.
+
+        Only entries that have updates are held back until the end of the
+        file, so memory stays proportional to the pending updates.
+        """
+        updates = {}
+        for record in self._records():
+            if 'update' in record:
+                updates.setdefault(record['update'], {}).update(
+                    (key, value) for key, value in record.items() if key != 'update')
+        for record in self._records():
+            if 'update' in record:
+                continue
+            if record.get('id') in updates:
+                record.update(updates[record['id']])
+            yield record
+
+    def compact(self):
+        """Rewrite the file with updates folded in and unreadable lines dropped"""
+        with self._lock:
+            # Holding the lock on the old file keeps other processes from appending
+            # to it while it is rewritten; they reopen the new file afterwards
+            f = self._locked_file()
+            try:
+                tmp = self.path + '.tmp'
+                with open(tmp, 'w', encoding='utf-8') as out:
+                    for entry in self.read():
+                        out.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                    out.flush()
+                    os.fsync(out.fileno())
+                if not FCNTL_AVAILABLE:
+                    f.close()  # Windows cannot replace a file that is open
+                os.replace(tmp, self.path)
+            finally:
+                if FCNTL_AVAILABLE:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+                f.close()
+                self._file = None
+            self._updates = 0
+            self._dirty = False
+
+    def _migrate(self, legacy_path):
+        """Import feedback_data.json written by earlier versions (either schema)"""
+        try:
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error("Could not migrate legacy feedback from %s: %s", legacy_path, e)
+            return
+
+        legacy = data.get('feedback', []) if isinstance(data, dict) else data
+        entries = []
+        for item in legacy:
+            if not isinstance(item, dict) or not item.get('original') or not item.get('correction'):
+                continue
+            if str(item.get('timestamp', '')).startswith('YYYY'):
+                continue  # Example entry shipped with the old file
+            entry = self.new_entry(item['original'], item['correction'],
+                                   source='legacy', context=item.get('context'))
+            entry['timestamp'] = item.get('timestamp', entry['timestamp'])
+            entry['processed'] = bool(item.get('processed', False))
+            entries.append(entry)
+
+        self.append_many(entries, sync=True)
+        logger.info("Migrated %d feedback entries from %s", len(entries), legacy_path)
+
+    def close(self):
+        self.sync()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,159 @@
+import atexit
+import queue
+import threading
+import time
+
+from structured_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Submissions waiting to be written before new ones are refused
+MAX_PENDING_FEEDBACK = 1000
+
+
+class FeedbackWriter:
+    """Writes feedback to a FeedbackStore from a background thread.
+
+    submit() only puts the entry on a bounded queue, so requests never wait
+    on disk. The flusher writes whatever has queued up as one batch, once
+    batch_size entries are waiting or flush_interval seconds have passed,
+    together with the matching lines of the review log. close() (also run
+    at exit) drains the queue before returning.
+
+    stats() takes the entry totals from FeedbackStore.counts(), so they cover
+    every process sharing the store; the batch, rejected and error counters
+    are for this process only.
+
+    on_write(entries), if given, is called with the stored entries at start,
+    with every batch once it is written and with the entries a reviewer marks
+    processed. It decides itself which entries to act on.
+    """
+
+    def __init__(self, store, log_path=None, max_pending=MAX_PENDING_FEEDBACK,
+                 batch_size=100, flush_interval=0.5, on_write=None):
+        self.store = store
+        self.log_path = log_path
+        self.on_write = on_write
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._closed = False
+        self.batches = 0
+        self.rejected = 0
+        self.errors = 0
+
+        if on_write is not None:
+            self._apply(list(store.read()))
+
+        self._thread = threading.Thread(target=self._run, name='feedback-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, entry):
+        """Queue an entry (see FeedbackStore.new_entry); False if the queue is full or closed"""
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait(entry)
+            return True
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            return False
+
+    def mark_processed(self, ids):
+        """Mark reviewed entries processed; returns the entries whose state changed"""
+        changed = self.store.mark_processed(ids)
+        self._apply(changed)
+        return changed
+
+    def _apply(self, entries):
+        if self.on_write is None or not entries:
+            return
+        try:
+            self.on_write(entries)
+        except Exception as e:
+            logger.error("Error applying feedback: %s", e)
+
+    def _take_batch(self):
+        """Block for the first entry, then gather more until the batch is full or due"""
+        first = self._queue.get()
+        if first is None:
+            return None, True
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                entry = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if entry is None:
+                return batch, True
+            batch.append(entry)
+        return batch, False
+
+    def _run(self):
+        stop = False
+        while not stop:
+            batch, stop = self._take_batch()
+            if batch:
+                self._write(batch, sync=stop)
+
+    def _write(self, batch, sync=False):
+        try:
+            self.store.append_many(batch, sync=sync)
+        except Exception as e:
+            with self._lock:
+                self.errors += len(batch)
+            logger.error("Error saving feedback: %s", e)
+            return
+
+        with self._lock:
+            self.batches += 1
+
+        if self.log_path:
+            try:
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    for entry in batch:
+                        f.write(f'[{entry["timestamp"]}] Original: "{entry["original"]}" '
+                                f'-> Correction: "{entry["correction"]}"\n')
+            except Exception as e:
+                logger.error("Error logging feedback: %s", e)
+
+        self._apply(batch)
+
+    def close(self, timeout=10):
+        """Write everything still queued, then close the store"""
+        if self._closed:
+            return
+        self._closed = True
+        deadline = time.monotonic() + timeout
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            logger.warning("Feedback writer did not drain within %ss; %d entries not written",
+                           timeout, self._queue.qsize())
+            return
+        self._thread.join(max(0, deadline - time.monotonic()))
+        if self._thread.is_alive():
+            logger.warning("Feedback writer still busy after %ss; store left open", timeout)
+            return
+        self.store.close()
+
+    def stats(self):
+        total, processed, latest = self.store.counts()
+        with self._lock:
+            return {
+                'total_entries': total,
+                'processed_entries': processed,
+                'unprocessed_entries': total - processed,
+                'latest_feedback': latest,
+                'pending': self._queue.qsize(),
+                'batches': self.batches,
+                'rejected': self.rejected,
+                'errors': self.errors
+            }
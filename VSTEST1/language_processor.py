@@ -1,28 +1,96 @@
+import os
+import threading
+import time
 from collections import defaultdict
 
+from structured_logging import get_logger
+
+logger = get_logger(__name__)
+
 # Initialize spaCy availability
 SPACY_AVAILABLE = False
 NLP_MODEL = None
 
-# Try to load spaCy and the model
-try:
-    import spacy
-    NLP_MODEL = spacy.load('en_core_web_sm')
-    SPACY_AVAILABLE = True
-    print("Successfully loaded spaCy and English model")
-except ImportError:
-    print("Warning: spaCy not available. Using basic text processing.")
-except OSError:
-    print("Warning: English model not found. Using basic processing.")
+# The analyzer only reads tag_, dep_, pos_, morph and text, which come from the
+# tagger, parser and attribute_ruler. Everything else is left out of the pipeline.
+SPACY_EXCLUDED_COMPONENTS = ['ner', 'lemmatizer', 'senter', 'textcat']
+
+# Worker processes used by analyze_many (1 keeps everything in-process)
+SPACY_N_PROCESS = int(os.environ.get('SPACY_N_PROCESS', '1'))
+
+def _load_spacy_model(name):
+    try:
+        return spacy.load(name, exclude=SPACY_EXCLUDED_COMPONENTS)
+    except (ValueError, KeyError):
+        # Older models may not know every excluded name; disable what is present
+        nlp = spacy.load(name)
+        nlp.select_pipes(disable=[c for c in SPACY_EXCLUDED_COMPONENTS if c in nlp.pipe_names])
+        return nlp
+
+_nlp_lock = threading.Lock()
+_nlp_loaded = False
+
+def get_nlp_model():
+    """The spaCy pipeline, loaded on first use; None if spaCy or the model is missing"""
+    global spacy, NLP_MODEL, SPACY_AVAILABLE, _nlp_loaded
+    if _nlp_loaded:
+        return NLP_MODEL
+    with _nlp_lock:
+        if _nlp_loaded:
+            return NLP_MODEL
+        # Try to load spaCy and the model
+        try:
+            import spacy
+            NLP_MODEL = _load_spacy_model('en_core_web_sm')
+            SPACY_AVAILABLE = True
+            logger.info("Loaded spaCy English model (pipeline: %s)", ', '.join(NLP_MODEL.pipe_names))
+        except ImportError:
+            logger.warning("spaCy not available. Using basic text processing.")
+        except OSError:
+            logger.warning("English model not found. Using basic processing.")
+        _nlp_loaded = True
+    return NLP_MODEL
+
+def load_nlp_async():
+    """Start loading spaCy in the background so the first request does not wait for all of it"""
+    threading.Thread(target=get_nlp_model, name='spacy-loader', daemon=True).start()
+
+class StageTimer:
+    """Thread-safe cumulative wall-clock timings per named processing stage"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = defaultdict(float)
+        self._calls = defaultdict(int)
+        
+    def add(self, stage, seconds, calls=1):
+        with self._lock:
+            self._totals[stage] += seconds
+            self._calls[stage] += calls
+            
+    def report(self):
+        """Return {stage: {'total_ms', 'calls', 'avg_ms'}}"""
+        with self._lock:
+            return {
+                stage: {
+                    'total_ms': round(total * 1000, 3),
+                    'calls': self._calls[stage],
+                    'avg_ms': round(total * 1000 / self._calls[stage], 3) if self._calls[stage] else 0.0
+                }
+                for stage, total in self._totals.items()
+            }
 
 class ContextAnalyzer:
     def __init__(self):
         self.context_history = defaultdict(list)
-        self.nlp = NLP_MODEL
+        self.timings = StageTimer()
         
-    def analyze(self, text):
-        """Enhanced context analysis with grammar structure"""
-        context = {
+    @property
+    def nlp(self):
+        return get_nlp_model()
+        
+    def _new_context(self):
+        return {
             'subject': None,
             'tense': None,
             'mood': None,
@@ -35,25 +103,90 @@ def analyze(self, text):
             'topicalization': None        # New: track topic-comment structure
         }
         
+    def _analyze_doc(self, text, doc, context):
+        try:
+            # Enhanced grammar analysis
+            start = time.perf_counter()
+            self._analyze_grammar_structure(doc, context)
+            grammar_done = time.perf_counter()
+            # Add non-manual markers
+            self._add_non_manual_markers(doc, context)
+            markers_done = time.perf_counter()
+            # Analyze emphasis
+            self._analyze_emphasis(doc, context)
+            
+            self.timings.add('grammar', grammar_done - start)
+            self.timings.add('non_manual_markers', markers_done - grammar_done)
+            self.timings.add('emphasis', time.perf_counter() - markers_done)
+            
+        except Exception as e:
+            logger.warning("Grammar analysis skipped: %s", e)
+            self._basic_processing(text, context)
+            
+    def _run_pipeline(self, texts, batch_size):
+        """Run the spaCy pipeline component by component, timing each stage"""
+        start = time.perf_counter()
+        docs = [self.nlp.make_doc(text) for text in texts]
+        self.timings.add('spacy.tokenizer', time.perf_counter() - start, len(docs))
+        
+        for name, proc in self.nlp.pipeline:
+            start = time.perf_counter()
+            if hasattr(proc, 'pipe'):
+                docs = list(proc.pipe(docs, batch_size=batch_size))
+            else:
+                docs = [proc(doc) for doc in docs]
+            self.timings.add(f'spacy.{name}', time.perf_counter() - start, len(docs))
+        return docs
+        
+    def analyze(self, text):
+        """Enhanced context analysis with grammar structure"""
+        context = self._new_context()
+        
         if self.nlp:
             try:
-                doc = self.nlp(text)
-                
-                # Enhanced grammar analysis
-                self._analyze_grammar_structure(doc, context)
-                # Add non-manual markers
-                self._add_non_manual_markers(doc, context)
-                # Analyze emphasis
-                self._analyze_emphasis(doc, context)
-                
+                doc = self._run_pipeline([text], batch_size=1)[0]
+                self._analyze_doc(text, doc, context)
             except Exception as e:
-                print(f"Grammar analysis skipped: {e}")
+                logger.warning("Grammar analysis skipped: %s", e)
                 self._basic_processing(text, context)
         else:
             self._basic_processing(text, context)
                 
         return context
     
+    def analyze_many(self, texts, batch_size=64, n_process=None):
+        """Analyze many texts, streaming them through spaCy in batches.
+        
+        With n_process > 1 spaCy parses across worker processes and only the
+        pipeline as a whole is timed. Yields one context per text, in input order.
+        """
+        texts = list(texts)
+        n_process = n_process or SPACY_N_PROCESS
+        if not self.nlp:
+            for text in texts:
+                context = self._new_context()
+                self._basic_processing(text, context)
+                yield context
+            return
+            
+        if n_process > 1:
+            start = time.perf_counter()
+            docs = self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+            for text, doc in zip(texts, docs):
+                self.timings.add('spacy.pipeline', time.perf_counter() - start)
+                context = self._new_context()
+                self._analyze_doc(text, doc, context)
+                yield context
+                start = time.perf_counter()
+            return
+            
+        for offset in range(0, len(texts), batch_size):
+            batch = texts[offset:offset + batch_size]
+            for text, doc in zip(batch, self._run_pipeline(batch, batch_size)):
+                context = self._new_context()
+                self._analyze_doc(text, doc, context)
+                yield context
+    
     def _analyze_grammar_structure(self, doc, context):
         """Analyze detailed grammar structure"""
         # Detect sentence type
@@ -135,8 +268,9 @@ def _basic_processing(self, text, context):
                     context['non_manual_markers'].append(f'{emotion}_expression')
 
 class GrammarConverter:
-    def __init__(self):
-        self.nlp = NLP_MODEL
+    @property
+    def nlp(self):
+        return get_nlp_model()
         
     def convert_to_asl(self, text, context):
         """Convert to ASL while preserving original functionality"""
@@ -0,0 +1,124 @@
+import hashlib
+import mimetypes
+import os
+import threading
+
+from flask import request, send_file
+from werkzeug.exceptions import NotFound
+from werkzeug.security import safe_join
+
+from translation_cache import LRUCache
+
+# Lifetime of media that is never replaced under the same name
+IMMUTABLE_MAX_AGE = int(os.environ.get('MEDIA_MAX_AGE', 365 * 24 * 3600))
+
+# Precompressed siblings served when the client accepts them, e.g. HELLO.mp4.br
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+
+# (path, size, mtime_ns) -> strong ETag, so each file version is hashed once
+_etags = LRUCache(max_entries=8192, max_bytes=None, ttl=None)
+
+
+def file_etag(path, stat=None):
+    """Strong ETag from a hash of the file's content"""
+    stat = stat or os.stat(path)
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    etag = _etags.get(key)
+    if etag is None:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        etag = digest.hexdigest()[:32]
+        _etags.put(key, etag)
+    return etag
+
+
+class MediaVersions:
+    """Versioned URLs (/media/<path>?v=<etag>) for the media paths a translation returns.
+
+    folders maps the folder prefix of a media path to its directory. A file's
+    ETag is recorded the first time it is linked and forgotten when
+    invalidate(directory) (wired to the media watcher) reports its folder
+    changed, so clients cache each version for good and fetch a replaced
+    file under its new URL.
+    """
+
+    def __init__(self, folders):
+        self.folders = folders
+        self._versions = {}  # media path -> ETag
+        self._lock = threading.Lock()
+
+    def url(self, media_path):
+        version = self._versions.get(media_path)
+        if version is None:
+            folder, _, name = media_path.partition('/')
+            directory = self.folders.get(folder)
+            path = safe_join(directory, name) if directory and name else None
+            if path is None or not os.path.isfile(path):
+                return f'/media/{media_path}'
+            version = file_etag(path)
+            with self._lock:
+                self._versions[media_path] = version
+        return f'/media/{media_path}?v={version}'
+
+    def urls(self, media_paths):
+        return [self.url(media_path) for media_path in media_paths]
+
+    def invalidate(self, directory):
+        """Forget the versions of every file in a changed folder"""
+        directory = os.path.abspath(directory)
+        prefixes = tuple(folder + '/' for folder, path in self.folders.items()
+                         if os.path.abspath(path) == directory)
+        if not prefixes:
+            return
+        with self._lock:
+            for media_path in [p for p in self._versions if p.startswith(prefixes)]:
+                del self._versions[media_path]
+
+
+def send_media(directory, filename, immutable=False):
+    """Serve a media file with a strong ETag, 304 responses and byte ranges.
+
+    Files that may be replaced under the same name (hot-reloaded media,
+    uploads) are revalidated by clients every time, which the ETag turns
+    into a 304. A request versioned with ?v=<etag>, or a file that is never
+    replaced (immutable=True, e.g. content-addressed names), is cached for
+    IMMUTABLE_MAX_AGE without revalidating.
+    """
+    path = safe_join(directory, filename)
+    if path is None or not os.path.isfile(path):
+        raise NotFound()
+
+    # Keep the type of the original even when a compressed variant is sent
+    mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    encoding = None
+    has_variants = False
+    send_path = path
+    for name, suffix in PRECOMPRESSED:
+        if os.path.isfile(path + suffix):
+            has_variants = True
+            if encoding is None and request.accept_encodings.quality(name):
+                encoding = name
+                send_path = path + suffix
+
+    version = request.args.get('v')
+    if version and version == file_etag(path):
+        immutable = True
+
+    response = send_file(
+        send_path,
+        mimetype=mimetype,
+        etag=file_etag(send_path),
+        conditional=True,
+        max_age=IMMUTABLE_MAX_AGE if immutable else None
+    )
+    if immutable:
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    if has_variants:
+        response.vary.add('Accept-Encoding')
+    return response
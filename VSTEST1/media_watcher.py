@@ -0,0 +1,143 @@
+import os
+import threading
+
+from structured_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Use native filesystem events when watchdog is installed, otherwise poll
+WATCHDOG_AVAILABLE = False
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+
+class MediaWatcher:
+    """Watches media directories and reports per-directory file changes.
+
+    on_change(directory, added, removed, modified) is called from the watcher
+    thread with the file names that appeared in, disappeared from or were
+    overwritten in one directory. A rename inside a directory is reported as a
+    removal plus an addition. Polling compares each file's size and mtime, so
+    a file replaced under the same name is reported as modified.
+    """
+
+    def __init__(self, directories, on_change, interval=2.0, use_watchdog=True):
+        self.directories = [os.path.abspath(d) for d in directories]
+        self.on_change = on_change
+        self.interval = interval
+        self.use_watchdog = use_watchdog and WATCHDOG_AVAILABLE
+        self._snapshots = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self._observer = None
+
+    def _scan(self, directory):
+        """File name -> (size, mtime_ns) of one directory"""
+        files = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    files[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            pass
+        return files
+
+    def start(self):
+        """Take the initial snapshot and start watching in the background"""
+        if self._thread or self._observer:
+            return self
+
+        for directory in self.directories:
+            self._snapshots[directory] = self._scan(directory)
+
+        if self.use_watchdog:
+            handler = _EventHandler(self)
+            self._observer = Observer()
+            for directory in self.directories:
+                if os.path.isdir(directory):
+                    self._observer.schedule(handler, directory, recursive=False)
+            self._observer.daemon = True
+            self._observer.start()
+        else:
+            self._thread = threading.Thread(target=self._poll_loop, name='media-watcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._observer:
+            self._observer.stop()
+            self._observer = None
+        if self._thread:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def _poll_loop(self):
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+    def poll(self):
+        """Compare every directory with its last snapshot"""
+        for directory in self.directories:
+            known = self._snapshots.get(directory, {})
+            current = self._scan(directory)
+            if current == known:
+                continue
+
+            self._snapshots[directory] = current
+            modified = [name for name in current.keys() & known.keys() if current[name] != known[name]]
+            self._notify(directory, current.keys() - known.keys(), known.keys() - current.keys(), modified)
+
+    def _notify(self, directory, added, removed, modified=()):
+        if not added and not removed and not modified:
+            return
+        try:
+            self.on_change(directory, sorted(added), sorted(removed), sorted(modified))
+        except Exception as e:
+            logger.error("Error applying media changes for %s: %s", directory, e)
+
+
+class _EventHandler(FileSystemEventHandler):
+    """Translates watchdog events into MediaWatcher change notifications"""
+
+    def __init__(self, watcher):
+        self.watcher = watcher
+
+    def _split(self, path):
+        return os.path.dirname(os.path.abspath(path)), os.path.basename(path)
+
+    def on_created(self, event):
+        if not event.is_directory:
+            directory, name = self._split(event.src_path)
+            self.watcher._notify(directory, [name], [])
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            directory, name = self._split(event.src_path)
+            self.watcher._notify(directory, [], [], [name])
+
+    def on_deleted(self, event):
+        if not event.is_directory:
+            directory, name = self._split(event.src_path)
+            self.watcher._notify(directory, [], [name])
+
+    def on_moved(self, event):
+        if event.is_directory:
+            return
+        src_dir, src_name = self._split(event.src_path)
+        dest_dir, dest_name = self._split(event.dest_path)
+        if src_dir == dest_dir:
+            self.watcher._notify(src_dir, [dest_name], [src_name])
+        else:
+            self.watcher._notify(src_dir, [], [src_name])
+            self.watcher._notify(dest_dir, [dest_name], [])
+
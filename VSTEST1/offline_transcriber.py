@@ -0,0 +1,299 @@
+import contextlib
+import json
+import multiprocessing
+import os
+import re
+import threading
+import time
+import uuid
+import wave
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from recognizer_pool import SAMPLE_RATE, new_recognizer
+
+# Frames handed to the recognizer per call; files are decoded as fast as the
+# CPU allows, with no real-time pacing (4 s of 16 kHz audio)
+READ_FRAMES = 4 * SAMPLE_RATE
+
+# Extensions decoded as headerless 16 kHz mono 16-bit PCM
+RAW_PCM_EXTENSIONS = ('.pcm', '.raw')
+
+# Models loaded by this process, by model directory. Each worker process of
+# the pool keeps its own, so a model is loaded once per worker, not per file.
+_models = {}
+
+
+def _model(model_path):
+    model = _models.get(model_path)
+    if model is None:
+        from vosk import Model  # Imported on first use, it is slow to load
+        model = _models[model_path] = Model(str(model_path))
+    return model
+
+
+@contextlib.contextmanager
+def _open_pcm(path):
+    """Yield (sample_rate, data_size, read, seek) for the PCM samples of a WAV or raw file.
+
+    Sizes and positions are byte offsets into the samples, not the file.
+    """
+    if path.lower().endswith(RAW_PCM_EXTENSIONS):
+        with open(path, 'rb') as f:
+            yield SAMPLE_RATE, os.path.getsize(path), f.read, f.seek
+        return
+
+    with wave.open(path, 'rb') as wav:
+        if wav.getnchannels() != 1 or wav.getsampwidth() != 2 or wav.getcomptype() != 'NONE':
+            raise ValueError("Audio must be mono 16-bit PCM WAV")
+        yield (wav.getframerate(), wav.getnframes() * 2,
+               lambda size: wav.readframes(size // 2), lambda offset: wav.setpos(offset // 2))
+
+
+def _segment(result, base_time, sample_rate, consumed, final):
+    text = result.get('text', '').strip()
+    if not text:
+        return None
+
+    words = [dict(word, start=round(word['start'] + base_time, 3), end=round(word['end'] + base_time, 3))
+             for word in result.get('result', [])]
+    # Resume right after the last word: the rest of the chunk already belongs
+    # to the next utterance
+    offset = consumed
+    if words and not final:
+        offset = min(consumed, int(words[-1]['end'] * sample_rate) * 2)
+    return {
+        'text': text,
+        'words': words,
+        'start': words[0]['start'] if words else None,
+        'end': words[-1]['end'] if words else None,
+        'offset': offset
+    }
+
+
+def stream_file(path, model, start=0, read_frames=READ_FRAMES):
+    """Decode a WAV or raw PCM file incrementally, yielding one segment per utterance.
+
+    Only read_frames of audio are held in memory at a time. Decoding starts at
+    byte offset start into the samples; each segment is {'text', 'words',
+    'start', 'end', 'offset'}, with times in seconds from the start of the
+    file and 'offset' the position to resume from once the segment is handled.
+    """
+    with _open_pcm(path) as (sample_rate, size, read, seek):
+        start = min(max(0, start - start % 2), size)
+        seek(start)
+        base_time = start / (2 * sample_rate)
+        recognizer = new_recognizer(model, sample_rate)
+        consumed = start
+
+        while True:
+            data = read(read_frames * 2)
+            if not data:
+                break
+            consumed += len(data)
+            if recognizer.AcceptWaveform(data):
+                segment = _segment(json.loads(recognizer.Result()), base_time, sample_rate, consumed, False)
+                if segment:
+                    yield segment
+
+        segment = _segment(json.loads(recognizer.FinalResult()), base_time, sample_rate, consumed, True)
+        if segment:
+            yield segment
+
+
+def audio_duration(path):
+    """Length of a WAV or raw PCM file in seconds"""
+    with _open_pcm(path) as (sample_rate, size, _, _):
+        return round(size / (2 * sample_rate), 3)
+
+
+def transcribe_file(path, model_path, read_frames=READ_FRAMES):
+    """Transcribe one WAV (16-bit mono PCM) or raw PCM file with a local Vosk model.
+
+    Returns {'text', 'words', 'duration'}; 'words' holds Vosk's per-word
+    results with start/end times in seconds.
+    """
+    segments = list(stream_file(path, _model(model_path), read_frames=read_frames))
+    return {
+        'text': ' '.join(segment['text'] for segment in segments),
+        'words': [word for segment in segments for word in segment['words']],
+        'duration': audio_duration(path)
+    }
+
+
+def is_supported(path):
+    """True if the file can be decoded locally (raw PCM or mono 16-bit PCM WAV)"""
+    if path.lower().endswith(RAW_PCM_EXTENSIONS):
+        return True
+    try:
+        with wave.open(path, 'rb') as wav:
+            return wav.getnchannels() == 1 and wav.getsampwidth() == 2 and wav.getcomptype() == 'NONE'
+    except (wave.Error, EOFError, OSError):
+        return False
+
+
+# Every worker process loads its own copy of each Vosk model it uses (several
+# hundred MB for the larger models), so the default pool is kept small
+DEFAULT_TRANSCRIBE_WORKERS = 2
+
+
+def _worker_context():
+    """Start workers without fork: the server process already runs threads
+    (decoders, logging, media watcher) whose locks a forked child would inherit"""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+class OfflineTranscriber:
+    """Transcribes audio files with local Vosk models in a pool of worker processes.
+
+    Decoding is CPU-bound, so files are spread across processes rather than
+    threads. With workers=0 files are decoded in the calling thread. Each
+    worker holds its own models in memory, so RAM grows with workers.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = DEFAULT_TRANSCRIBE_WORKERS if workers is None else workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=_worker_context())
+            return self._executor
+
+    def submit(self, path, model_path):
+        """Start transcribing a file; returns a Future of transcribe_file's result"""
+        if not self.workers:
+            future = Future()
+            try:
+                future.set_result(transcribe_file(path, model_path))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        return self._pool().submit(transcribe_file, path, model_path)
+
+    def transcribe(self, path, model_path):
+        return self.submit(path, model_path).result()
+
+    def transcribe_many(self, jobs):
+        """Transcribe (path, model_path) pairs in parallel.
+
+        Returns one result per job, in order; a failed file's entry is the
+        exception raised for it.
+        """
+        futures = [self.submit(path, model_path) for path, model_path in jobs]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+
+class TranscriptionJobs:
+    """Uploaded files kept on disk so a long transcription can resume after interruption.
+
+    A job is the uploaded audio plus a small JSON record of its language and
+    the byte offset to resume from. Both are removed once the file has been
+    fully decoded. Every checkpoint (and every resume) touches both files;
+    a job whose files have all gone untouched for max_age seconds is
+    discarded as a whole.
+    """
+
+    _JOB_ID = re.compile(r'[0-9a-f]{32}')
+
+    def __init__(self, directory, max_age=24 * 3600):
+        self.directory = directory
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _record_path(self, job_id):
+        return os.path.join(self.directory, f'{job_id}.json')
+
+    def create(self, audio_file, language):
+        """Store an uploaded file and return its job"""
+        self._discard_stale()
+        job_id = uuid.uuid4().hex
+        suffix = os.path.splitext(audio_file.filename or '')[1].lower() or '.wav'
+        job = {
+            'job_id': job_id,
+            'language': language,
+            'path': os.path.join(self.directory, job_id + suffix),
+            'offset': 0
+        }
+        audio_file.save(job['path'])
+        self._write(job)
+        return job
+
+    def get(self, job_id):
+        """The job with this id, or None if it is unknown, finished or expired"""
+        if not job_id or not self._JOB_ID.fullmatch(job_id):
+            return None
+        try:
+            with open(self._record_path(job_id), 'r', encoding='utf-8') as f:
+                job = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(job['path']):
+            return None
+        self._touch(job)
+        return job
+
+    def save_progress(self, job, offset):
+        job['offset'] = offset
+        self._write(job)
+        self._touch(job)
+
+    def _touch(self, job):
+        # Keeps a running or resumed job from being discarded as stale
+        try:
+            os.utime(job['path'])
+        except OSError:
+            pass
+
+    def finish(self, job):
+        for path in (job['path'], self._record_path(job['job_id'])):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _write(self, job):
+        # Write then rename so an interrupted write never loses the last offset
+        path = self._record_path(job['job_id'])
+        with self._lock:
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(job, f)
+            os.replace(path + '.tmp', path)
+
+    def _discard_stale(self):
+        cutoff = time.time() - self.max_age
+        jobs = {}
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                continue
+            job_id = name.split('.', 1)[0]  # Audio, record and any .tmp share the id
+            newest, paths = jobs.get(job_id, (0, []))
+            paths.append(path)
+            jobs[job_id] = (max(newest, mtime), paths)
+
+        for newest, paths in jobs.values():
+            if newest >= cutoff:
+                continue
+            for path in paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
@@ -0,0 +1,85 @@
+class PhraseTrie:
+    """Word-level trie used to split text into the longest known multi-word phrases.
+
+    Segmentation is greedy leftmost-longest: at every position the longest phrase
+    starting there is taken, otherwise the single word is emitted. Each position
+    walks at most max_length words, so the cost is linear in the input length.
+    """
+
+    _END = None  # Marks a node where a complete phrase ends
+
+    def __init__(self, phrases=()):
+        self._root = {}
+        self.max_length = 1
+        for phrase in phrases:
+            self.add(phrase)
+
+    def add(self, phrase):
+        words = phrase.lower().split()
+        if not words:
+            return
+        node = self._root
+        for word in words:
+            node = node.setdefault(word, {})
+        node[self._END] = True
+        self.max_length = max(self.max_length, len(words))
+
+    def with_phrases(self, phrases):
+        """Copy of this trie with more phrases; only the nodes on their paths are copied"""
+        trie = PhraseTrie()
+        trie._root = dict(self._root)
+        trie.max_length = self.max_length
+        copied = {id(trie._root)}
+        for phrase in phrases:
+            words = phrase.lower().split()
+            if not words:
+                continue
+            node = trie._root
+            for word in words:
+                child = node.get(word)
+                if child is None:
+                    child = {}
+                    copied.add(id(child))
+                elif id(child) not in copied:
+                    child = dict(child)
+                    copied.add(id(child))
+                node[word] = child
+                node = child
+            node[self._END] = True
+            trie.max_length = max(trie.max_length, len(words))
+        return trie
+
+    def longest_match(self, words, start=0):
+        """Length in words of the longest phrase starting at words[start] (0 if none)"""
+        node = self._root
+        match = 0
+        for offset in range(start, min(len(words), start + self.max_length)):
+            node = node.get(words[offset].lower())
+            if node is None:
+                break
+            if self._END in node:
+                match = offset - start + 1
+        return match
+
+    def extends(self, words):
+        """True if the words are the start of some longer phrase"""
+        node = self._root
+        for word in words:
+            node = node.get(word.lower())
+            if node is None:
+                return False
+        return any(key is not self._END for key in node)
+
+    def segment(self, words):
+        """Split a word list into phrases and single words, preserving the original text"""
+        segments = []
+        i = 0
+        while i < len(words):
+            length = self.longest_match(words, i) if self._root else 0
+            if length > 1:
+                segments.append(' '.join(words[i:i + length]))
+                i += length
+            else:
+                segments.append(words[i])
+                i += 1
+        return segments
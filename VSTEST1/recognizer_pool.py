@@ -0,0 +1,250 @@
+import secrets
+import threading
+import time
+from collections import defaultdict
+
+from structured_logging import get_logger
+
+logger = get_logger(__name__)
+
+SAMPLE_RATE = 16000
+
+# Model states reported by RecognizerPool.status()
+MODEL_UNLOADED = 'unloaded'
+MODEL_LOADING = 'loading'
+MODEL_READY = 'ready'
+MODEL_ERROR = 'error'
+
+# Silence decoded once after loading so the first real stream does not pay
+# for lazy initialisation inside the decoder (100 ms of 16-bit mono audio)
+WARMUP_AUDIO = b'\x00\x00' * (SAMPLE_RATE // 10)
+
+# Seconds an idle (not recording) client session is kept
+SESSION_TTL = 30 * 60
+
+
+def new_recognizer(model, sample_rate=SAMPLE_RATE):
+    """KaldiRecognizer that reports word start/end times in its results"""
+    from vosk import KaldiRecognizer  # Imported on first use, it is slow to load
+    recognizer = KaldiRecognizer(model, sample_rate)
+    recognizer.SetWords(True)
+    # Word times in partial results need vosk 0.3.42 or later
+    if hasattr(recognizer, 'SetPartialWords'):
+        recognizer.SetPartialWords(True)
+    return recognizer
+
+
+class RecognizerPool:
+    """Process-wide Vosk models shared read-only, plus pooled KaldiRecognizers.
+
+    Each language's Model is loaded once by model_loader(language) and shared by
+    every stream, either on first use or ahead of time in a background thread
+    with load_async()/preload(). Recognizers are checked out per stream with
+    acquire() and reset and returned with release(); up to max_idle per
+    language are kept.
+    """
+
+    def __init__(self, model_loader, sample_rate=SAMPLE_RATE, max_idle=4):
+        self.model_loader = model_loader
+        self.sample_rate = sample_rate
+        self.max_idle = max_idle
+        self._models = {}
+        self._model_locks = defaultdict(threading.Lock)
+        self._idle = defaultdict(list)
+        self._in_use = defaultdict(int)
+        self._status = {}
+        self._errors = {}
+        self._lock = threading.Lock()
+
+    def get_model(self, language):
+        """Return the shared Model for a language, loading it on first use"""
+        model = self._models.get(language)
+        if model is not None:
+            return model
+
+        with self._lock:
+            model_lock = self._model_locks[language]
+        with model_lock:
+            model = self._models.get(language)
+            if model is None:
+                self._status[language] = MODEL_LOADING
+                try:
+                    model = self.model_loader(language)
+                    self._warm_up(language, model)
+                except Exception as e:
+                    self._status[language] = MODEL_ERROR
+                    self._errors[language] = str(e)
+                    raise
+                self._models[language] = model
+                self._status[language] = MODEL_READY
+                self._errors.pop(language, None)
+        return model
+
+    def _warm_up(self, language, model):
+        """Run a short decode and keep the recognizer for the first stream"""
+        try:
+            recognizer = new_recognizer(model, self.sample_rate)
+            recognizer.AcceptWaveform(WARMUP_AUDIO)
+            recognizer.FinalResult()
+            recognizer.Reset()
+        except Exception as e:
+            logger.warning("Warmup failed for %s: %s", language, e)
+            return
+        with self._lock:
+            if len(self._idle[language]) < self.max_idle:
+                self._idle[language].append(recognizer)
+
+    def load_async(self, language):
+        """Start loading a language's model in the background; returns its status"""
+        with self._lock:
+            status = self._status.get(language, MODEL_UNLOADED)
+            if status in (MODEL_LOADING, MODEL_READY):
+                return status
+            self._status[language] = MODEL_LOADING
+
+        def load():
+            try:
+                self.get_model(language)
+            except Exception as e:
+                logger.error("Background load of %s model failed: %s", language, e)
+
+        threading.Thread(target=load, name=f'model-loader-{language}', daemon=True).start()
+        return MODEL_LOADING
+
+    def preload(self, languages):
+        """Load several languages' models in the background"""
+        for language in languages:
+            self.load_async(language)
+
+    def status(self, language):
+        """One of 'unloaded', 'loading', 'ready' or 'error'"""
+        return self._status.get(language, MODEL_UNLOADED)
+
+    def error(self, language):
+        return self._errors.get(language)
+
+    def acquire(self, language):
+        """Check out a recognizer for one stream"""
+        with self._lock:
+            idle = self._idle[language]
+            recognizer = idle.pop() if idle else None
+            self._in_use[language] += 1
+
+        if recognizer is None:
+            try:
+                recognizer = new_recognizer(self.get_model(language), self.sample_rate)
+            except Exception:
+                with self._lock:
+                    self._in_use[language] -= 1
+                raise
+        return recognizer
+
+    def release(self, language, recognizer):
+        """Reset a recognizer and return it to the pool"""
+        try:
+            recognizer.Reset()
+        except Exception as e:
+            logger.warning("Discarding recognizer for %s: %s", language, e)
+            recognizer = None
+
+        with self._lock:
+            self._in_use[language] -= 1
+            if recognizer is not None and len(self._idle[language]) < self.max_idle:
+                self._idle[language].append(recognizer)
+
+    def stats(self):
+        with self._lock:
+            return {
+                language: {
+                    'status': self._status.get(language, MODEL_UNLOADED),
+                    'in_use': self._in_use[language],
+                    'idle': len(self._idle[language])
+                }
+                for language in set(self._status) | set(self._in_use)
+            }
+
+
+class StreamSession:
+    """Per-client state: selected language and the live stream's stop flag"""
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.language = None
+        self.stop_event = None
+        self.last_seen = time.monotonic()
+
+    @property
+    def is_recording(self):
+        return self.stop_event is not None and not self.stop_event.is_set()
+
+
+class SessionManager:
+    """Keeps each client's language and stream independent of every other client.
+
+    Session ids are issued by the server (create()); ids it did not issue are
+    never looked up into new sessions. Sessions that are not recording and have
+    not been used for ttl seconds are dropped.
+    """
+
+    def __init__(self, ttl=SESSION_TTL):
+        self.ttl = ttl
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def create(self):
+        """New session with a fresh unguessable id"""
+        session = StreamSession(secrets.token_urlsafe(16))
+        with self._lock:
+            self._expire()
+            self._sessions[session.session_id] = session
+        return session
+
+    def get(self, session_id):
+        """The session with this id, or None if it was never issued or has expired"""
+        with self._lock:
+            session = self._sessions.get(session_id) if session_id else None
+            if session is not None:
+                session.last_seen = time.monotonic()
+            return session
+
+    def _expire(self):
+        cutoff = time.monotonic() - self.ttl
+        for session_id, session in list(self._sessions.items()):
+            if session.last_seen < cutoff and not session.is_recording:
+                del self._sessions[session_id]
+
+    def start_stream(self, session_id):
+        """Stop the session's previous stream and return the new stream's stop event"""
+        session = self.get(session_id)
+        if session is None:
+            return None
+        with self._lock:
+            if session.stop_event is not None:
+                session.stop_event.set()
+            session.stop_event = threading.Event()
+            return session.stop_event
+
+    def end_stream(self, session_id, stop_event):
+        """Mark a stream as finished by itself; a newer stream of the session is left alone"""
+        stop_event.set()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None and session.stop_event is stop_event:
+                session.stop_event = None
+                session.last_seen = time.monotonic()
+
+    def stop_stream(self, session_id):
+        session = self.get(session_id)
+        if session is None:
+            return
+        with self._lock:
+            if session.stop_event is not None:
+                session.stop_event.set()
+
+    def active_streams(self):
+        with self._lock:
+            return sum(1 for session in self._sessions.values() if session.is_recording)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
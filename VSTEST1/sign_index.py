@@ -0,0 +1,249 @@
+import string
+
+from phrase_trie import PhraseTrie
+from structured_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Folder prefixes used in the paths returned to the browser (served under /media/)
+VIDEO_FOLDER = "mp4videos"
+ASL_FOLDER = "alphabetimages"
+ISL_FOLDER = "indianalphabetsandnumbers"
+UPLOADS_FOLDER = "uploads"
+
+# Languages that fingerspell with the Indian alphabet images
+ISL_LANGUAGES = ('isl', 'hindi', 'telugu', 'gujarati')
+
+# Sign played when nothing in the input could be resolved
+FALLBACK_SIGN = "not_understand.mp4"
+
+
+class SignIndex:
+    """Immutable token -> sign media lookup built from one snapshot of the media catalog.
+
+    corrections holds, per language, phrases whose signs were corrected by
+    user feedback ({key: media paths}); they are looked up before the
+    catalog tables. See with_corrections().
+    """
+
+    def __init__(self, word_tables, spellers, fallback=None, version=0,
+                 corrections=None, table_phrases=None, phrases=None):
+        self._word_tables = word_tables
+        self._spellers = spellers
+        self._corrections = corrections or {language: {} for language in word_tables}
+        # Multi-word keys of each table, for longest-match phrase segmentation
+        self._table_phrases = table_phrases or {
+            language: PhraseTrie(key for key in table if ' ' in key)
+            for language, table in word_tables.items()
+        }
+        # The same plus multi-word corrections, which are segmented as one unit too
+        self._phrases = phrases or self._table_phrases
+        self.fallback = fallback
+        self.version = version
+
+    def _language(self, language):
+        language = (language or 'asl').lower()
+        return language if language in self._word_tables else 'asl'
+
+    def lookup(self, token, language='asl'):
+        """Return the precompiled media paths for a token, or None if it has to be spelled"""
+        language = self._language(language)
+        key = token.lower()
+        paths = self._corrections[language].get(key)
+        if paths is None:
+            paths = self._word_tables[language].get(key)
+        return paths
+
+    def spell(self, word, language='asl'):
+        """Fingerspell a word letter by letter, followed by a space sign"""
+        return self._spellers[self._language(language)].spell(word)
+
+    def resolve(self, token, language='asl'):
+        """Resolve one token to its sign clip or, failing that, its fingerspelling sequence"""
+        paths = self.lookup(token, language)
+        if paths is None:
+            paths = self.spell(token, language)
+        return paths
+
+    def phrases(self, language='asl'):
+        """PhraseTrie of the multi-word entries that have their own sign"""
+        return self._phrases[self._language(language)]
+
+    def segment(self, words, language='asl'):
+        """Group words into the longest phrases that have their own sign"""
+        words = [word for word in words if word and not word.isspace()]
+        return self._phrases[self._language(language)].segment(words)
+
+    def resolve_all(self, words, language='asl'):
+        """Resolve a sequence of tokens into one flat playlist, one clip per known phrase"""
+        playlist = []
+        for segment in self.segment(words, language):
+            playlist.extend(self.resolve(segment, language))
+        return playlist
+
+    def _resolve_uncorrected(self, text, language):
+        """Playlist for text from the catalog tables alone, ignoring corrections"""
+        playlist = []
+        for segment in self._table_phrases[language].segment(text.split()):
+            paths = self._word_tables[language].get(segment.lower())
+            playlist.extend(paths if paths is not None else self.spell(segment, language))
+        return tuple(playlist)
+
+    def with_corrections(self, corrections, version):
+        """Copy of this index with more feedback corrections in its first tier.
+
+        corrections maps a language (None for every language) to
+        {original: corrected text}. Only these pairs are compiled, each
+        corrected text resolved through the catalog tables; corrections
+        already in this index are kept unless overridden. Entries for
+        languages the index does not know are dropped. The copy shares the
+        tables, the overlays of languages without new pairs and all trie
+        nodes off the new phrases' paths with this index.
+        """
+        new = {}
+        for language in (None,) + tuple(key for key in corrections if key is not None):
+            pairs = corrections.get(language)
+            if not pairs:
+                continue
+            if language is None:
+                targets = tuple(self._word_tables)
+            elif language.lower() in self._word_tables:
+                targets = (language.lower(),)
+            else:
+                logger.warning("Dropping %d corrections for unknown language %r", len(pairs), language)
+                continue
+            for target in targets:
+                for original, corrected in pairs.items():
+                    key = _key(original)
+                    paths = self._resolve_uncorrected(corrected, target)
+                    if key and paths:
+                        new.setdefault(target, {})[key] = paths
+
+        overlay = dict(self._corrections)
+        phrases = dict(self._phrases)
+        for language, compiled in new.items():
+            overlay[language] = {**self._corrections[language], **compiled}
+            multi_word = [key for key in compiled if ' ' in key]
+            if multi_word:
+                phrases[language] = self._phrases[language].with_phrases(multi_word)
+
+        return SignIndex(self._word_tables, self._spellers, fallback=self.fallback, version=version,
+                         corrections=overlay, table_phrases=self._table_phrases, phrases=phrases)
+
+
+class _Speller:
+    """Maps single characters to alphabet images for one alphabet set"""
+
+    def __init__(self, folder, files, suffix, char_map=None):
+        self.folder = folder
+        self.files = {file.lower(): file for file in files}
+        self.suffix = suffix
+        self.char_map = char_map or {}
+        self.space = self._image('SPACE')
+        self.table = self._compile()
+
+    def _image(self, name):
+        file = self.files.get(f"{name}{self.suffix}".lower())
+        return f"{self.folder}/{file}" if file else None
+
+    def letter(self, char):
+        if char in self.char_map:
+            # Regional script characters spell through their Latin equivalent,
+            # empty mappings (halant/virama) are skipped
+            mapped = self.char_map[char].upper()
+            return self._image(mapped) if mapped else None
+        if char.isalpha():
+            return self._image(char.upper())
+        if char.isdigit():
+            return self._image(char)
+        return None
+
+    def _compile(self):
+        """Precompute the image for every character this alphabet set is expected to spell"""
+        chars = set(string.ascii_letters) | set(string.digits) | set(self.char_map)
+        return {char: self.letter(char) for char in chars}
+
+    def spell(self, word):
+        paths = []
+        for char in word:
+            path = self.table[char] if char in self.table else self.letter(char)
+            if path:
+                paths.append(path)
+
+        if paths and self.space:
+            paths.append(self.space)
+        return tuple(paths)
+
+
+def _key(word):
+    return ' '.join(word.lower().split())
+
+
+def _compile_word_table(chain, videos, uploads, speller, language):
+    """Flatten a language's resolver chain into one word -> media paths dict.
+
+    The chain is walked from the lowest to the highest priority tier, so earlier
+    tiers overwrite later ones. Dictionary entries whose file is missing are
+    skipped and fall through to the lower tiers; word maps resolve the mapped
+    word through the tiers below them, fingerspelling it if none has a sign.
+    """
+    table = {}
+
+    for kind, source in reversed(chain):
+        if kind == 'direct':
+            # <word>.mp4 files in the video folder
+            for name, file in videos.items():
+                if name.endswith('.mp4'):
+                    table[_key(name[:-4])] = (f"{VIDEO_FOLDER}/{file}",)
+        elif kind == 'videos':
+            for word, file in source.items():
+                if file.lower() in videos:
+                    table[_key(word)] = (f"{VIDEO_FOLDER}/{videos[file.lower()]}",)
+        elif kind == 'uploads':
+            for word, file in uploads.items():
+                table[_key(word)] = (f"{UPLOADS_FOLDER}/{language}/{file}",)
+        elif kind == 'word_map':
+            for word, mapped in source.items():
+                paths = table.get(_key(mapped))
+                table[_key(word)] = paths if paths is not None else speller.spell(mapped)
+        else:
+            raise ValueError(f"Unknown sign resolver for {language}: {kind}")
+
+    return table
+
+
+def build_sign_index(video_files, asl_files, isl_files, resolvers, char_maps,
+                     uploads=None, corrections=None, version=0):
+    """Compile the media catalog and each language's resolver chain into a SignIndex.
+
+    resolvers maps a language to its ordered chain of (kind, source) tiers:
+    ('uploads', None), ('videos', {word: file}), ('word_map', {word: word}) or
+    ('direct', None). Words no tier resolves are fingerspelled at lookup time.
+    corrections from user feedback (see SignIndex.with_corrections) take
+    precedence over every tier.
+    """
+    # File names are matched case-insensitively, as on the macOS/Windows
+    # filesystems the dictionaries were written against
+    videos = {file.lower(): file for file in video_files}
+    uploads = uploads or {}
+
+    word_tables = {}
+    spellers = {}
+
+    for language, chain in resolvers.items():
+        if language in ISL_LANGUAGES:
+            speller = _Speller(ISL_FOLDER, isl_files, '.jpg', char_maps.get(language, {}))
+        else:
+            speller = _Speller(ASL_FOLDER, asl_files, '_test.jpg', char_maps.get(language, {}))
+        spellers[language] = speller
+        word_tables[language] = _compile_word_table(
+            chain, videos, uploads.get(language, {}), speller, language
+        )
+
+    fallback = None
+    if FALLBACK_SIGN.lower() in videos:
+        fallback = f"{VIDEO_FOLDER}/{videos[FALLBACK_SIGN.lower()]}"
+    index = SignIndex(word_tables, spellers, fallback=fallback, version=version)
+    if corrections:
+        index = index.with_corrections(corrections, version)
+    return index
@@ -1,29 +1,69 @@
 from language_processor import ContextAnalyzer, GrammarConverter, ExpressionGenerator
-import json
+from translation_cache import cache_from_env, normalize_text
+from feedback_store import FeedbackStore
+from feedback_writer import FeedbackWriter
 import os
-import datetime
 
 class SignTranslator:
-    def __init__(self):
+    def __init__(self, feedback_writer=None):
         self.context_analyzer = ContextAnalyzer()
         self.grammar_converter = GrammarConverter()
         self.expression_generator = ExpressionGenerator()
-        self.feedback_data = []
+        # Repeated phrases skip context analysis entirely
+        self.cache = cache_from_env('TRANSLATION_CACHE')
         self.feedback_dir = os.path.join(os.path.dirname(__file__), 'feedback')
         self.feedback_file = os.path.join(self.feedback_dir, 'feedback_data.json')
         
-        # Create feedback directory if it doesn't exist
-        if not os.path.exists(self.feedback_dir):
-            os.makedirs(self.feedback_dir)
-            
-        # Load existing feedback
-        self._load_feedback()
+        # Share the app's writer when given, so there is a single writer per file
+        self.feedback_writer = feedback_writer or FeedbackWriter(
+            FeedbackStore(
+                os.path.join(self.feedback_dir, 'feedback.jsonl'),
+                legacy_path=self.feedback_file
+            ),
+            log_path=os.path.join(self.feedback_dir, 'feedback.log')
+        )
         
     def translate(self, text, target_language='asl'):
-        """Translate text to sign language with context awareness"""
+        """Translate text to sign language with context awareness.
+        
+        Results are cached by normalized text and language; treat them as read-only.
+        """
+        key = (normalize_text(text), target_language)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+            
         # Analyze context
         context = self.context_analyzer.analyze(text)
+        translation = self._build_sequence(text, context, target_language)
+        self.cache.put(key, translation)
+        return translation
+        
+    def translate_many(self, texts, target_languages='asl', batch_size=64):
+        """Translate many texts, sharing one batched context analysis pass.
+        
+        target_languages is either one language for every text or a list with
+        one language per text. Cached texts are answered without analysis.
+        Yields translations in input order.
+        """
+        texts = list(texts)
+        if isinstance(target_languages, str):
+            target_languages = [target_languages] * len(texts)
+            
+        keys = [(normalize_text(text), language) for text, language in zip(texts, target_languages)]
+        cached = [self.cache.get(key) for key in keys]
+        misses = [text for text, hit in zip(texts, cached) if hit is None]
         
+        contexts = self.context_analyzer.analyze_many(misses, batch_size=batch_size)
+        for text, language, key, hit in zip(texts, target_languages, keys, cached):
+            if hit is not None:
+                yield hit
+                continue
+            translation = self._build_sequence(text, next(contexts), language)
+            self.cache.put(key, translation)
+            yield translation
+            
+    def _build_sequence(self, text, context, target_language):
         # Convert grammar based on target language
         if target_language == 'isl':
             sign_sequence = self.grammar_converter.convert_to_isl(text, context)
@@ -36,63 +76,18 @@ def translate(self, text, target_language='asl'):
         
         return final_sequence
         
-    def learn_from_feedback(self, original, correction):
+    def learn_from_feedback(self, original, correction, language=None):
         """Learn from user feedback"""
-        feedback_entry = {
-            'timestamp': datetime.datetime.now().isoformat(),
-            'original': original,
-            'correction': correction,
-            'context': self.context_analyzer.analyze(original),
-            'processed': False  # Flag for processing feedback later
-        }
-        self.feedback_data.append(feedback_entry)
-        
-        # Save feedback data
-        self._save_feedback()
-        
-        # Log feedback for review
-        self._log_feedback(feedback_entry)
+        feedback_entry = FeedbackStore.new_entry(
+            original, correction,
+            language=language,
+            source='translator',
+            context=self.context_analyzer.analyze(original)
+        )
         
-        return True
-        
-    def _save_feedback(self):
-        """Save feedback data to JSON file"""
-        try:
-            with open(self.feedback_file, 'w', encoding='utf-8') as f:
-                json.dump(self.feedback_data, f, indent=2, ensure_ascii=False)
-            print(f"Feedback saved to {self.feedback_file}")
-        except Exception as e:
-            print(f"Error saving feedback: {e}")
-            
-    def _load_feedback(self):
-        """Load previous feedback data"""
-        try:
-            if os.path.exists(self.feedback_file):
-                with open(self.feedback_file, 'r', encoding='utf-8') as f:
-                    self.feedback_data = json.load(f)
-                print(f"Loaded {len(self.feedback_data)} feedback entries")
-        except Exception as e:
-            print(f"Error loading feedback: {e}")
-            self.feedback_data = []
-            
-    def _log_feedback(self, entry):
-        """Log feedback to a separate log file"""
-        log_file = os.path.join(self.feedback_dir, 'feedback.log')
-        try:
-            with open(log_file, 'a', encoding='utf-8') as f:
-                f.write(f"\n--- Feedback Entry {entry['timestamp']} ---\n")
-                f.write(f"Original: {entry['original']}\n")
-                f.write(f"Correction: {entry['correction']}\n")
-                f.write(f"Context: {entry['context']}\n")
-                f.write("-" * 50 + "\n")
-        except Exception as e:
-            print(f"Error logging feedback: {e}")
+        # Written and logged for review by the background writer
+        return self.feedback_writer.submit(feedback_entry)
             
     def get_feedback_stats(self):
         """Get statistics about collected feedback"""
-        return {
-            'total_entries': len(self.feedback_data),
-            'processed_entries': sum(1 for entry in self.feedback_data if entry['processed']),
-            'unprocessed_entries': sum(1 for entry in self.feedback_data if not entry['processed']),
-            'latest_feedback': self.feedback_data[-1] if self.feedback_data else None
-        } 
\ No newline at end of file
+        return self.feedback_writer.stats()
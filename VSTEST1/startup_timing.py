@@ -0,0 +1,52 @@
+import contextlib
+import os
+import threading
+import time
+
+# 'fast' (default) skips the diagnostic walks and per-file output at startup;
+# 'verbose' runs the full permission test, media listing and model tree dump
+STARTUP_MODE = os.environ.get('STARTUP_MODE', 'fast').lower()
+VERBOSE_STARTUP = STARTUP_MODE == 'verbose'
+
+_started = time.perf_counter()
+
+
+class StartupTimer:
+    """Wall-clock time of each named startup stage, in the order they ran"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = []
+        self.ready_ms = None
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name, seconds):
+        with self._lock:
+            self._stages.append((name, round(seconds * 1000, 1)))
+
+    def ready(self):
+        """Mark startup as finished and print the breakdown"""
+        self.ready_ms = round((time.perf_counter() - _started) * 1000, 1)
+        stages = ', '.join(f"{name} {ms:.0f} ms" for name, ms in self.report()['stages'].items())
+        print(f"Startup ({STARTUP_MODE}) took {self.ready_ms:.0f} ms: {stages}")
+
+    def report(self):
+        with self._lock:
+            stages = {}
+            for name, ms in self._stages:
+                stages[name] = round(stages.get(name, 0) + ms, 1)
+        return {
+            'mode': STARTUP_MODE,
+            'ready_ms': self.ready_ms,
+            'stages': stages
+        }
+
+
+startup_timer = StartupTimer()
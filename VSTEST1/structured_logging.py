@@ -0,0 +1,138 @@
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from collections import defaultdict
+
+# LOG_LEVEL sets the default level; LOG_LEVELS overrides it per module,
+# e.g. "audio_stream=DEBUG,voice_to_sign=WARNING"
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_LEVELS = os.environ.get('LOG_LEVELS', '')
+# 'text' or 'json' (one object per line)
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text').lower()
+# Records waiting for the writer thread before new ones are dropped
+LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+
+# Pass as extra= on per-token debug logs: only one in LOG_SAMPLE_EVERY of the
+# records from the same call site is written
+SAMPLED = {'sample_every': int(os.environ.get('LOG_SAMPLE_EVERY', 50))}
+
+_configured = False
+_lock = threading.Lock()
+
+
+class SampleFilter(logging.Filter):
+    """Keeps one in every N records that carry sample_every, counted per call site"""
+
+    def __init__(self):
+        super().__init__()
+        self._counts = defaultdict(int)
+        # Filters run on the logging threads, not the listener
+        self._counts_lock = threading.Lock()
+
+    def filter(self, record):
+        every = getattr(record, 'sample_every', None)
+        if not every or every <= 1:
+            return True
+        site = (record.name, record.lineno)
+        with self._counts_lock:
+            count = self._counts[site]
+            self._counts[site] = count + 1
+        return count % every == 0
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks the caller: records are dropped when the queue is full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record):
+        """Merge the arguments into the message but keep any traceback apart in exc_text,
+        where the listener's formatter finds it (QueueHandler.prepare folds it into msg)"""
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record; fields passed as extra={'fields': {...}} are included"""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        fields = getattr(record, 'fields', None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def _parse_levels(spec):
+    levels = {}
+    for item in spec.split(','):
+        name, _, level = item.partition('=')
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure():
+    """Install the queue handler on the root logger (idempotent).
+
+    Callers only format and enqueue records that pass their logger's level;
+    a listener thread writes them to stdout.
+    """
+    global _configured
+    with _lock:
+        if _configured:
+            return
+        log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        handler = DroppingQueueHandler(log_queue)
+        handler.addFilter(SampleFilter())
+
+        output = logging.StreamHandler(sys.stdout)
+        if LOG_FORMAT == 'json':
+            output.setFormatter(JsonFormatter())
+        else:
+            output.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+        listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+
+        root = logging.getLogger()
+        root.setLevel(LOG_LEVEL)
+        root.addHandler(handler)
+        for name, level in _parse_levels(LOG_LEVELS).items():
+            logging.getLogger(name).setLevel(level)
+        _configured = True
+
+
+def get_logger(name):
+    """Logger for a module, with logging configured on first use"""
+    configure()
+    return logging.getLogger(name)
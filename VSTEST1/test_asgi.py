@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for the SSE caption endpoints of the ASGI app, driven with a fake receive/send
+"""
+import asyncio
+import unittest
+
+import asgi
+
+
+class FakeClient:
+    """ASGI receive/send pair: sends http.request, then http.disconnect once told to leave"""
+
+    def __init__(self):
+        self.sent = []
+        self.leave = asyncio.Event()
+        self._requested = False
+
+    async def receive(self):
+        if not self._requested:
+            self._requested = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await self.leave.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        self.sent.append(message)
+
+    def bodies(self):
+        return [m.get('body') for m in self.sent if m['type'] == 'http.response.body']
+
+
+class ServeCaptionsTest(unittest.TestCase):
+
+    def run_async(self, coroutine):
+        return asyncio.run(coroutine)
+
+    def test_events_are_delivered_until_disconnect(self):
+        async def scenario():
+            client = FakeClient()
+            serving = asyncio.ensure_future(
+                asgi.serve_captions({'type': 'http'}, client.receive, client.send, 'test-session'))
+            await asyncio.sleep(0.05)
+            # The initial http.request must not end the stream
+            self.assertEqual(asgi.hub.listener_count('test-session'), 1)
+
+            asgi.hub.publish('test-session', {'text': 'hello'})
+            await asyncio.sleep(0.05)
+            self.assertIn(b'data: {"text": "hello"}\n\n', client.bodies())
+
+            client.leave.set()
+            await asyncio.wait_for(serving, 1)
+            self.assertEqual(asgi.hub.listener_count('test-session'), 0)
+            return client
+
+        client = self.run_async(scenario())
+        self.assertEqual(client.sent[0]['type'], 'http.response.start')
+
+    def test_response_is_completed_when_ended_by_the_server(self):
+        async def scenario():
+            client = FakeClient()
+            serving = asyncio.ensure_future(
+                asgi.serve_captions({'type': 'http'}, client.receive, client.send, 'test-session'))
+            await asyncio.sleep(0.05)
+            serving.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await serving
+            return client
+
+        client = self.run_async(scenario())
+        last = client.sent[-1]
+        self.assertEqual(last['type'], 'http.response.body')
+        self.assertFalse(last.get('more_body'))
+        self.assertEqual(asgi.hub.listener_count('test-session'), 0)
+
+
+class SessionRequiredTest(unittest.TestCase):
+
+    def call(self, scope):
+        client = FakeClient()
+
+        async def scenario():
+            serving = asyncio.ensure_future(asgi.application(scope, client.receive, client.send))
+            await asyncio.sleep(0.05)
+            client.leave.set()
+            await asyncio.wait_for(serving, 1)
+
+        asyncio.run(scenario())
+        return client
+
+    def test_unknown_session_is_rejected(self):
+        for query in (b'', b'session_id=default', b'session_id=forged'):
+            client = self.call({'type': 'http', 'method': 'GET', 'path': '/captions',
+                                'query_string': query, 'headers': []})
+            self.assertEqual(client.sent[0]['status'], 403)
+
+    def test_stop_stream_needs_an_issued_session(self):
+        client = self.call({'type': 'http', 'method': 'POST', 'path': '/stop_stream',
+                            'query_string': b'', 'headers': []})
+        self.assertEqual(client.sent[0]['status'], 403)
+
+    def test_issued_session_from_cookie_is_served(self):
+        session = asgi.flask_app.sessions.create()
+        cookie = f'{asgi.flask_app.SESSION_COOKIE}={session.session_id}'.encode()
+        client = self.call({'type': 'http', 'method': 'GET', 'path': '/captions',
+                            'query_string': b'', 'headers': [(b'cookie', cookie)]})
+        self.assertEqual(client.sent[0]['status'], 200)
+
+    def test_audio_socket_without_session_is_closed(self):
+        sent = []
+
+        async def receive():
+            return {'type': 'websocket.connect'}
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(asgi.application({'type': 'websocket', 'path': '/ws/audio',
+                                      'query_string': b'session_id=default', 'headers': []},
+                                     receive, send))
+        self.assertEqual(sent, [{'type': 'websocket.close', 'code': 1008, 'reason': 'Unknown session'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for HypothesisTracker: committing stable words and partial deltas
+"""
+import unittest
+
+from audio_stream import HypothesisTracker
+
+
+def texts(committed):
+    return [(word['offset'], word['text']) for word in committed]
+
+
+class HypothesisTrackerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tracker = HypothesisTracker()
+
+    def test_word_is_committed_once_stable_and_not_last(self):
+        committed, delta = self.tracker.partial(['hello'])
+        self.assertEqual(committed, [])
+        self.assertEqual(delta, {'offset': 0, 'words': ['hello']})
+
+        # Still the last word: it may be growing
+        committed, delta = self.tracker.partial(['hello'])
+        self.assertEqual(committed, [])
+        self.assertIsNone(delta)
+
+        committed, delta = self.tracker.partial(['hello', 'world'])
+        self.assertEqual(texts(committed), [(0, 'hello')])
+        self.assertEqual(delta, {'offset': 1, 'words': ['world']})
+
+    def test_changed_word_is_not_committed(self):
+        self.tracker.partial(['I', 'scream'])
+        committed, delta = self.tracker.partial(['ice', 'cream', 'now'])
+        self.assertEqual(committed, [])
+        self.assertEqual(delta, {'offset': 0, 'words': ['ice', 'cream', 'now']})
+
+    def test_committed_words_are_never_retracted(self):
+        self.tracker.partial(['a', 'b'])
+        self.assertEqual(texts(self.tracker.partial(['a', 'b', 'c'])[0]), [(0, 'a'), (1, 'b')])
+        # The recognizer revises an already committed word; nothing is sent again
+        committed, _ = self.tracker.partial(['x', 'b', 'c', 'd'])
+        self.assertEqual(committed, [])
+        self.assertEqual(texts(self.tracker.final(['x', 'b', 'c', 'd'])), [(2, 'c'), (3, 'd')])
+
+    def test_final_commits_the_rest_and_offsets_continue(self):
+        self.tracker.partial(['good', 'morning'])
+        self.tracker.partial(['good', 'morning', 'to'])
+        self.assertEqual(texts(self.tracker.final(['good', 'morning', 'to', 'you'])),
+                         [(2, 'to'), (3, 'you')])
+
+        # Repeated words in the next utterance keep their own offsets
+        self.tracker.partial(['good'])
+        committed, delta = self.tracker.partial(['good', 'good'])
+        self.assertEqual(texts(committed), [(4, 'good')])
+        self.assertEqual(delta, {'offset': 1, 'words': ['good']})
+        self.assertEqual(texts(self.tracker.final(['good', 'good'])), [(5, 'good')])
+
+    def test_word_times_are_kept(self):
+        times = [{'word': 'hi', 'start': 0.1, 'end': 0.3}, {'word': 'there', 'start': 0.4, 'end': 0.7}]
+        committed = self.tracker.final(['hi', 'there'], times)
+        self.assertEqual(committed[1], {'text': 'there', 'offset': 1, 'start': 0.4, 'end': 0.7})
+
+
+if __name__ == '__main__':
+    unittest.main()
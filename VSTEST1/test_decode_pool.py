@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for DecodePool: event order, end-of-stream signalling and close()
+"""
+import queue
+import threading
+import unittest
+
+from decode_pool import DecodePool
+
+
+class FakeRecognition:
+    """RecognitionStream stand-in: each feed() returns the bytes it was given"""
+
+    def __init__(self, fail_finish=False, gate=None):
+        self.fail_finish = fail_finish
+        self.gate = gate
+        self.busy = False
+        self.started = threading.Event()
+        self.fed = []
+
+    def feed(self, data):
+        self.busy = True
+        self.started.set()
+        try:
+            if self.gate is not None:
+                self.gate.wait(1)
+            self.fed.append(data)
+            return [{'data': data}]
+        finally:
+            self.busy = False
+
+    def finish(self):
+        if self.fail_finish:
+            raise RuntimeError('flush failed')
+        return [{'final': True}]
+
+
+class DecodePoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = DecodePool(workers=2, max_pending=4)
+        self.events = queue.Queue()
+
+    def drain(self):
+        """Everything handed to on_events up to and including the end signal"""
+        received = []
+        while True:
+            events = self.events.get(timeout=1)
+            received.append(events)
+            if events is None:
+                return received
+
+    def test_finish_delivers_events_then_end_signal(self):
+        stream = self.pool.open(FakeRecognition(), self.events.put)
+        stream.submit(b'a')
+        stream.submit(b'b')
+        stream.finish()
+
+        received = self.drain()
+        self.assertIsNone(received[-1])
+        decoded = b''.join(event['data'] for events in received[:-1] for event in events if 'data' in event)
+        self.assertEqual(decoded, b'ab')
+        self.assertEqual(received[-2], [{'final': True}])
+        self.assertTrue(stream.done.wait(1))
+
+    def test_end_signal_is_sent_when_finish_fails(self):
+        stream = self.pool.open(FakeRecognition(fail_finish=True), self.events.put)
+        stream.finish()
+        self.assertEqual(self.drain(), [None])
+
+    def test_finish_after_close_signals_at_once(self):
+        stream = self.pool.open(FakeRecognition(), self.events.put)
+        self.pool.close(stream)
+        stream.finish()
+        stream.finish()
+        self.assertIsNone(self.events.get(timeout=1))
+        self.assertTrue(self.events.empty())
+
+    def test_close_waits_for_decode_in_progress(self):
+        gate = threading.Event()
+        recognition = FakeRecognition(gate=gate)
+        stream = self.pool.open(recognition, self.events.put)
+        stream.submit(b'a')
+        self.assertTrue(recognition.started.wait(1))
+
+        closer = threading.Thread(target=self.pool.close, args=(stream,))
+        closer.start()
+        closer.join(0.1)
+        self.assertTrue(closer.is_alive())
+        gate.set()
+        closer.join(1)
+        self.assertFalse(closer.is_alive())
+        self.assertFalse(recognition.busy)
+
+    def test_oldest_audio_is_dropped_when_behind(self):
+        gate = threading.Event()
+        recognition = FakeRecognition(gate=gate)
+        stream = self.pool.open(recognition, self.events.put)
+        stream.submit(b'0')
+        self.assertTrue(recognition.started.wait(1))
+        for chunk in b'123456':
+            stream.submit(bytes([chunk]))
+        stream.finish()
+        gate.set()
+        self.drain()
+
+        self.assertEqual(stream.dropped, 2)
+        self.assertEqual(recognition.fed, [b'0', b'3456'])
+
+
+if __name__ == '__main__':
+    unittest.main()
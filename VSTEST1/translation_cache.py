@@ -0,0 +1,118 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+def normalize_text(text):
+    """Collapse runs of whitespace so trivially different inputs share a cache entry"""
+    return ' '.join(text.split()) if isinstance(text, str) else tuple(text)
+
+
+def _approx_size(key, value):
+    return len(repr(key)) + len(repr(value))
+
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by entry count and approximate size in bytes.
+
+    Entries older than ttl seconds are treated as misses. Cached values are
+    shared between callers and must not be mutated.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=None, ttl=None, sizeof=_approx_size):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self._entries = OrderedDict()  # key -> (value, expires_at, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            value, expires_at, size = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        size = self.sizeof(key, value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return  # Would evict everything else and still not fit
+
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[key] = (value, expires_at, size)
+            self._bytes += size
+
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, computing and caching it on a miss"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+
+def cache_from_env(prefix, max_entries=1024, max_bytes=8 * 1024 * 1024, ttl=3600):
+    """Build an LRUCache sized by <prefix>_SIZE, <prefix>_BYTES and <prefix>_TTL"""
+    ttl = float(os.environ.get(f'{prefix}_TTL', ttl))
+    return LRUCache(
+        max_entries=int(os.environ.get(f'{prefix}_SIZE', max_entries)),
+        max_bytes=int(os.environ.get(f'{prefix}_BYTES', max_bytes)),
+        ttl=ttl if ttl > 0 else None
+    )
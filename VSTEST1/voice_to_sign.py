@@ -1,14 +1,23 @@
 import os
 import sys
 from pathlib import Path
-from vosk import Model, KaldiRecognizer
-import traceback
-from textblob import TextBlob
-import speech_recognition as sr
 from flask import Flask, request, jsonify
 from werkzeug.utils import secure_filename
 from flask_cors import CORS
 import stat
+import itertools
+import tempfile
+import threading
+from sign_index import build_sign_index
+from media_watcher import MediaWatcher
+from translation_cache import cache_from_env
+from recognizer_pool import new_recognizer
+from offline_transcriber import OfflineTranscriber, DEFAULT_TRANSCRIBE_WORKERS, is_supported
+from audio_stream import align_signs
+from startup_timing import startup_timer, VERBOSE_STARTUP
+from structured_logging import get_logger
+
+logger = get_logger(__name__)
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -17,6 +26,14 @@
 # Check directory permissions on startup
 def check_directory_permissions():
     upload_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "uploads")
+    if not VERBOSE_STARTUP:
+        # Fast startup: an access check instead of writing a test file
+        os.makedirs(upload_path, mode=0o755, exist_ok=True)
+        if not os.access(upload_path, os.W_OK):
+            print(f"Upload directory is not writable: {upload_path}")
+            return False
+        return True
+        
     print("\nChecking upload directory permissions:")
     print(f"Upload path: {upload_path}")
     
@@ -60,7 +77,9 @@ def check_directory_permissions():
         return False
 
 # Check directory permissions on startup
-if not check_directory_permissions():
+with startup_timer.stage('permissions'):
+    upload_ok = check_directory_permissions()
+if not upload_ok:
     print("Error: Upload directory is not properly configured!")
     sys.exit(1)
 
@@ -79,6 +98,14 @@ def check_directory_permissions():
 VOSK_MODEL_PATH_TELUGU = os.path.join(PROJECT_PATH, "models", "vosk-model-small-te-0.42")
 VOSK_MODEL_PATH_GUJARATI = os.path.join(PROJECT_PATH, "models", "vosk-model-small-gu-0.42")
 
+VOSK_MODEL_PATHS = {
+    'isl': VOSK_MODEL_PATH_ISL,
+    'asl': VOSK_MODEL_PATH_ASL,
+    'hindi': VOSK_MODEL_PATH_HINDI,
+    'telugu': VOSK_MODEL_PATH_TELUGU,
+    'gujarati': VOSK_MODEL_PATH_GUJARATI
+}
+
 # Indian alphabets path
 INDIAN_ALPHABET_IMAGES_PATH = os.path.join(PROJECT_PATH, "indianalphabetsandnumbers")
 
@@ -168,32 +195,32 @@ def scan_available_media():
     isl_images = {}
     
     # Scan MP4 videos
-    print("\nScanning available videos...")
     for file in os.listdir(VIDEOS_PATH):
         if file.endswith('.mp4'):
             base_name = file[:-4].lower()  # Remove .mp4 and convert to lowercase
             videos[base_name] = file
-            print(f"Found video: {file}")
+            if VERBOSE_STARTUP:
+                print(f"Found video: {file}")
     
     # Scan ASL alphabet images
-    print("\nScanning ASL alphabet images...")
     for file in os.listdir(ALPHABET_IMAGES_PATH):
         if file.endswith('_test.jpg'):
             base_name = file[:-9].lower()  # Remove _test.jpg and convert to lowercase
             asl_images[base_name] = file
-            print(f"Found ASL image: {file}")
+            if VERBOSE_STARTUP:
+                print(f"Found ASL image: {file}")
             
             # Also map uppercase version for special cases
             if base_name.upper() == base_name:
                 asl_images[base_name.lower()] = file
     
     # Scan ISL alphabet images
-    print("\nScanning ISL alphabet images...")
     for file in os.listdir(INDIAN_ALPHABET_IMAGES_PATH):
         if file.endswith('.jpg'):
             base_name = file[:-4].lower()  # Remove .jpg and convert to lowercase
             isl_images[base_name] = file
-            print(f"Found ISL image: {file}")
+            if VERBOSE_STARTUP:
+                print(f"Found ISL image: {file}")
             
             # Also map uppercase version for special cases
             if base_name.upper() == base_name:
@@ -210,15 +237,16 @@ def scan_available_media():
         if word.isupper():  # If filename is uppercase, map lowercase version too
             videos[word.lower()] = file
     
-    print("\nTotal media files found:")
-    print(f"Videos: {len(videos)}")
-    print(f"ASL Images: {len(asl_images)}")
-    print(f"ISL Images: {len(isl_images)}")
+    print(f"Media found: {len(videos)} videos, {len(asl_images)} ASL images, {len(isl_images)} ISL images")
     
     return videos, asl_images, isl_images
 
 # Scan available media files
-AVAILABLE_VIDEOS, ASL_IMAGES, ISL_IMAGES = scan_available_media()
+with startup_timer.stage('media_scan'):
+    AVAILABLE_VIDEOS, ASL_IMAGES, ISL_IMAGES = scan_available_media()
+
+# Signs uploaded through /upload_sign, per language (filled in once uploads/ exists)
+UPLOADED_SIGNS = {}
 
 # Update dictionaries based on available files
 video_dict = {
@@ -551,42 +579,45 @@ def scan_available_media():
 # Remove the automatic model loading and verification at import
 # Instead, just define the functions
 
+def vosk_model_path(language):
+    """Return the verified model directory for a language, raising if it is unusable"""
+    if language not in VOSK_MODEL_PATHS:
+        raise ValueError(f"Unsupported language: {language}")
+        
+    model_path = VOSK_MODEL_PATHS[language]
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"Model not found for {language} at {model_path}")
+        
+    # Verify key directories exist
+    required_dirs = ['am', 'conf', 'graph', 'ivector']
+    for dir_name in required_dirs:
+        if not os.path.exists(os.path.join(model_path, dir_name)):
+            raise FileNotFoundError(f"Required directory '{dir_name}' not found in {language} model")
+    return model_path
+
+def load_vosk_model(language):
+    """Load the Vosk Model for a language (shareable by any number of recognizers)"""
+    from vosk import Model  # Imported on first use, it is slow to load
+    model = Model(str(vosk_model_path(language)))
+    logger.info("%s model loaded successfully", language.upper())
+    return model
+
 def load_model(language):
     """Load speech recognition model for specified language"""
     try:
-        model_paths = {
-            'isl': VOSK_MODEL_PATH_ISL,
-            'asl': VOSK_MODEL_PATH_ASL,
-            'hindi': VOSK_MODEL_PATH_HINDI,
-            'telugu': VOSK_MODEL_PATH_TELUGU,
-            'gujarati': VOSK_MODEL_PATH_GUJARATI
-        }
-        
-        if language not in model_paths:
-            raise ValueError(f"Unsupported language: {language}")
-            
-        model_path = model_paths[language]
-        if not os.path.exists(model_path):
-            raise FileNotFoundError(f"Model not found for {language} at {model_path}")
-            
-        # Verify key directories exist
-        required_dirs = ['am', 'conf', 'graph', 'ivector']
-        for dir_name in required_dirs:
-            if not os.path.exists(os.path.join(model_path, dir_name)):
-                raise FileNotFoundError(f"Required directory '{dir_name}' not found in {language} model")
-        
-        # Load the model
-        model = Model(str(model_path))
-        recognizer = KaldiRecognizer(model, 16000)
-        print(f"{language.upper()} model loaded successfully")
+        model = load_vosk_model(language)
+        recognizer = new_recognizer(model, 16000)
         return model, recognizer
         
     except Exception as e:
-        print(f"Error loading {language.upper()} model: {str(e)}")
+        logger.error("Error loading %s model: %s", language.upper(), e)
         raise
 
 def verify_models():
-    """Verify model existence and print detailed status"""
+    """Verify model existence from a few key files per model (no directory walk).
+    
+    The detailed per-model report is printed with STARTUP_MODE=verbose only.
+    """
     models = {
         'ASL': VOSK_MODEL_PATH_ASL,
         'ISL': VOSK_MODEL_PATH_ISL,
@@ -597,12 +628,14 @@ def verify_models():
     
     missing_models = []
     
-    print("\nVerifying speech recognition models:")
-    print("=" * 50)
+    if VERBOSE_STARTUP:
+        print("\nVerifying speech recognition models:")
+        print("=" * 50)
     
     for name, path in models.items():
-        print(f"\nChecking {name} model:")
-        print(f"Path: {path}")
+        if VERBOSE_STARTUP:
+            print(f"\nChecking {name} model:")
+            print(f"Path: {path}")
         
         if not os.path.exists(path):
             print(f"❌ {name} model directory not found")
@@ -629,7 +662,7 @@ def verify_models():
             for item in missing_items:
                 print(f"  - {item}")
             missing_models.append(name)
-        else:
+        elif VERBOSE_STARTUP:
             print(f"✓ {name} model is complete and ready")
             print(f"  Found all required components:")
             for item in required_items:
@@ -645,7 +678,8 @@ def verify_models():
     return missing_models
 
 # Store missing models without trying to load them
-MISSING_MODELS = verify_models()
+with startup_timer.stage('model_check'):
+    MISSING_MODELS = verify_models()
 
 def inspect_model_paths():
     """Inspect and print the contents of model directories"""
@@ -678,250 +712,45 @@ def inspect_model_paths():
             
     print("\n" + "=" * 50)
 
-# Call the inspection function
-inspect_model_paths()
+# Dump the model trees only when asked to; walking them is slow
+if VERBOSE_STARTUP:
+    with startup_timer.stage('model_inspection'):
+        inspect_model_paths()
 
-def text_to_sign(signs, language='asl'):
-    """Convert text to sign language video paths"""
-    video_paths = []
+def text_to_sign(signs, language='asl', index=None):
+    """Convert text to sign language video paths.
     
-    try:
-        print(f"\nChecking directories:")
-        print(f"ASL Path: {ALPHABET_IMAGES_PATH}")
-        print(f"ISL Path: {INDIAN_ALPHABET_IMAGES_PATH}")
-        print(f"Videos Path: {VIDEOS_PATH}")
-        
-        # Verify directories exist
-        if not os.path.exists(ALPHABET_IMAGES_PATH):
-            print(f"Warning: ASL directory does not exist!")
-            return []
-        if not os.path.exists(INDIAN_ALPHABET_IMAGES_PATH):
-            print(f"Warning: ISL directory does not exist!")
-            return []
-        if not os.path.exists(VIDEOS_PATH):
-            print(f"Warning: Videos directory does not exist!")
-            return []
-            
-        # Scan available files
-        asl_files = set(os.listdir(ALPHABET_IMAGES_PATH))
-        isl_files = set(os.listdir(INDIAN_ALPHABET_IMAGES_PATH))
-        video_files = set(os.listdir(VIDEOS_PATH))
-        
-        print(f"\nFound files:")
-        print(f"ASL files: {len(asl_files)}")
-        print(f"ISL files: {len(isl_files)}")
-        print(f"Video files: {len(video_files)}")
-        
-    except Exception as e:
-        print(f"Error scanning directories: {e}")
-        traceback.print_exc()
+    Pass index to resolve several texts against the same SignIndex snapshot.
+    Results are cached per index version, so catalog changes invalidate them.
+    """
+    index = index or get_sign_index()
+    if index is None:
+        logger.warning("Sign index has not been built yet")
         return []
 
     try:
-        # First check if this is a regional language or ISL
-        is_regional = language.lower() in ['hindi', 'telugu', 'gujarati', 'isl']
-        
-        if is_regional or language.lower() == 'isl':
-            # ISL and regional language handling
-            # Create English to ISL character mapping (uppercase to match actual files)
-            english_to_isl = {
-                'a': 'A', 'b': 'B', 'c': 'C', 'd': 'D', 'e': 'E',
-                'f': 'F', 'g': 'G', 'h': 'H', 'i': 'I', 'j': 'J',
-                'k': 'K', 'l': 'L', 'm': 'M', 'n': 'N', 'o': 'O',
-                'p': 'P', 'q': 'Q', 'r': 'R', 's': 'S', 't': 'T',
-                'u': 'U', 'v': 'V', 'w': 'W', 'x': 'X', 'y': 'Y', 'z': 'Z'
-            }
-            
-            # Select appropriate dictionary and character map
-            video_dict_to_use = isl_video_dict
-            char_map = regional_char_maps.get(language.lower(), {})
-            
-            # Map words through regional_to_isl dictionary
-            mapped_words = []
-            for word in signs.split():
-                if word in regional_to_isl:
-                    mapped_word = regional_to_isl[word]
-                    print(f"Mapped '{word}' to '{mapped_word}'")
-                    mapped_words.append(mapped_word)
-                else:
-                    mapped_words.append(word)
-            
-            words = mapped_words
+        words = signs.split() if isinstance(signs, str) else signs
+        key = (' '.join(words).lower(), language.lower(), index.version)
+        cached = SIGN_CACHE.get(key)
+        if cached is not None:
+            return list(cached)
 
-            print(f"\nProcessing text in {language.upper()}: {words}")
-            
-            for word in words:
-                if not word or word.isspace():
-                    continue
-                    
-                original_word = word.lower()
-                print(f"Processing word: '{original_word}'")
-                
-                # Try video matches first
-                video_found = False
-                
-                # Try video matches (common signs, dictionary, direct MP4)
-                if original_word in common_signs:
-                    video_path = common_signs[original_word]
-                    if os.path.exists(os.path.join(VIDEOS_PATH, video_path)):
-                        video_paths.append(f"mp4videos/{video_path}")
-                        print(f"Found common video for: {original_word}")
-                        video_found = True
-                        continue
-
-                if not video_found and original_word in video_dict_to_use:
-                    video_path = video_dict_to_use[original_word]
-                    if os.path.exists(os.path.join(VIDEOS_PATH, video_path)):
-                        video_paths.append(f"mp4videos/{video_path}")
-                        print(f"Found video for: {original_word}")
-                        video_found = True
-                        continue
-
-                direct_video = f"{original_word}.mp4"
-                if not video_found and os.path.exists(os.path.join(VIDEOS_PATH, direct_video)):
-                    video_paths.append(f"mp4videos/{direct_video}")
-                    print(f"Found direct video match for: {original_word}")
-                    video_found = True
-                    continue
-
-                # If no video found, spell using ISL alphabet images
-                if not video_found:
-                    print(f"No video found, spelling word: {word}")
-                    has_letters = False
-                    
-                    # For ISL/regional, spell using Indian alphabet images
-                    for char in word:
-                        if is_regional and char in char_map:
-                            # Use mapped character for regional scripts
-                            mapped_char = char_map[char].upper()  # Convert to uppercase
-                            if mapped_char:  # Skip empty mappings (like halant)
-                                char_file = f"{mapped_char}.jpg"
-                                if char_file in isl_files:
-                                    has_letters = True
-                                    video_paths.append(f"indianalphabetsandnumbers/{char_file}")
-                                    print(f"Added mapped ISL character: {mapped_char}")
-                                    continue
-                                else:
-                                    print(f"No ISL image found for mapped character: {mapped_char}")
-                        elif char.isalpha():
-                            # For English characters or ISL
-                            char_upper = char.upper()
-                            char_file = f"{char_upper}.jpg"
-                            if char_file in isl_files:
-                                has_letters = True
-                                video_paths.append(f"indianalphabetsandnumbers/{char_file}")
-                                print(f"Added ISL character: {char_upper}")
-                                continue
-                            else:
-                                print(f"No ISL image found for character: {char}")
-                        elif char.isdigit():
-                            num_file = f"{char}.jpg"
-                            if num_file in isl_files:
-                                has_letters = True
-                                video_paths.append(f"indianalphabetsandnumbers/{num_file}")
-                                print(f"Added ISL number: {char}")
-                                continue
-                            else:
-                                print(f"No ISL image found for number: {char}")
-                        else:
-                            print(f"Skipping character: {char}")
-                    
-                    # Add space after spelled words
-                    if has_letters:
-                        space_file = "SPACE.jpg"
-                        if space_file in isl_files:
-                            video_paths.append(f"indianalphabetsandnumbers/{space_file}")
-
-        else:  # ASL handling
-            video_dict_to_use = video_dict
-            words = signs.split() if isinstance(signs, str) else signs
-
-            print(f"\nProcessing text in ASL: {words}")
-            
-            for word in words:
-                if not word or word.isspace():
-                    continue
-                    
-                original_word = word.lower()
-                print(f"Processing word: '{original_word}'")
-                
-                # Try video matches first
-                video_found = False
-                
-                # Try video matches (common signs, dictionary, direct MP4)
-                if original_word in common_signs:
-                    video_path = common_signs[original_word]
-                    if os.path.exists(os.path.join(VIDEOS_PATH, video_path)):
-                        video_paths.append(f"mp4videos/{video_path}")
-                        print(f"Found common video for: {original_word}")
-                        video_found = True
-                        continue
-
-                if not video_found and original_word in video_dict_to_use:
-                    video_path = video_dict_to_use[original_word]
-                    if os.path.exists(os.path.join(VIDEOS_PATH, video_path)):
-                        video_paths.append(f"mp4videos/{video_path}")
-                        print(f"Found video for: {original_word}")
-                        video_found = True
-                        continue
-
-                direct_video = f"{original_word}.mp4"
-                if not video_found and os.path.exists(os.path.join(VIDEOS_PATH, direct_video)):
-                    video_paths.append(f"mp4videos/{direct_video}")
-                    print(f"Found direct video match for: {original_word}")
-                    video_found = True
-                    continue
-
-                # If no video found, spell using ASL alphabet images
-                if not video_found:
-                    print(f"No video found, spelling word: {word}")
-                    has_letters = False
-                    
-                    # For ASL, spell using alphabet images
-                    for char in word:
-                        if char.isalpha():
-                            char_upper = char.upper()
-                            char_file = f"{char_upper}_test.jpg"
-                            if char_file in asl_files:
-                                has_letters = True
-                                video_paths.append(f"alphabetimages/{char_file}")
-                                print(f"Added ASL character: {char_upper}")
-                                continue
-                            else:
-                                print(f"No ASL image found for character: {char}")
-                        elif char.isdigit():
-                            num_file = f"{char}_test.jpg"
-                            if num_file in asl_files:
-                                has_letters = True
-                                video_paths.append(f"alphabetimages/{num_file}")
-                                print(f"Added ASL number: {char}")
-                                continue
-                            else:
-                                print(f"No ASL image found for number: {char}")
-                        else:
-                            print(f"Skipping character: {char}")
-                    
-                    # Add space after spelled words
-                    if has_letters:
-                        space_file = "SPACE_test.jpg"
-                        if space_file in asl_files:
-                            video_paths.append(f"alphabetimages/{space_file}")
+        logger.debug("Processing text in %s: %s", language.upper(), words)
+
+        video_paths = index.resolve_all(words, language)
 
         if video_paths:
-            print(f"Generated {len(video_paths)} video paths")
-            print("Paths:", video_paths)
-            return video_paths
+            logger.debug("Generated %d video paths: %s", len(video_paths), video_paths)
         else:
-            print("No signs found for the given text")
+            logger.debug("No signs found for %s", words)
             # Return a "not found" or "error" sign if available
-            error_sign = "not_understand.mp4"
-            if os.path.exists(os.path.join(VIDEOS_PATH, error_sign)):
-                return [f"mp4videos/{error_sign}"]
-            return []
+            video_paths = [index.fallback] if index.fallback else []
+
+        SIGN_CACHE.put(key, tuple(video_paths))
+        return video_paths
             
     except Exception as e:
-        print(f"Error in text_to_sign: {e}")
-        traceback.print_exc()
+        logger.exception("Error in text_to_sign: %s", e)
         return []
 
 # Update the regional dictionaries with complete mappings
@@ -1100,6 +929,112 @@ def text_to_sign(signs, language='asl'):
     # This ensures words are properly mapped to ISL signs
 })
 
+# Resolution order for each language, highest priority first. Each chain is
+# compiled into a single lookup table per language by build_sign_index; words
+# that no tier resolves are fingerspelled.
+def _regional_resolvers(phrase_dict):
+    return [
+        ('videos', phrase_dict),        # The language's own words and phrases
+        ('word_map', regional_to_isl),  # Regional word -> ISL word, resolved by the tiers below
+        ('uploads', None),
+        ('videos', common_signs),
+        ('videos', isl_video_dict),
+        ('direct', None),
+    ]
+
+SIGN_RESOLVERS = {
+    'asl': [
+        ('uploads', None),
+        ('videos', common_signs),
+        ('videos', video_dict),
+        ('direct', None),
+    ],
+    'isl': [
+        ('word_map', regional_to_isl),
+        ('uploads', None),
+        ('videos', common_signs),
+        ('videos', isl_video_dict),
+        ('direct', None),
+    ],
+    'hindi': _regional_resolvers(hindi_video_dict),
+    'telugu': _regional_resolvers(telugu_video_dict),
+    'gujarati': _regional_resolvers(gujarati_video_dict),
+}
+
+# Precompiled sign lookup, rebuilt and swapped whenever the media tree changes
+_sign_index = None
+_sign_index_lock = threading.RLock()
+_sign_index_versions = itertools.count(1)
+
+# Resolved playlists, keyed by text, language and index version
+SIGN_CACHE = cache_from_env('SIGN_CACHE')
+
+# Corrections from user feedback, language (None for all) -> {original: corrected text};
+# the newest correction of a phrase wins
+SIGN_CORRECTIONS = {}
+
+def get_sign_index():
+    """Return the current SignIndex (swapped atomically, safe to read without locking)"""
+    return _sign_index
+
+def rebuild_sign_index(videos=None, asl_images=None, isl_images=None, uploads=None):
+    """Compile a new SignIndex from a media catalog snapshot and swap it in"""
+    global _sign_index
+    videos = AVAILABLE_VIDEOS if videos is None else videos
+    asl_images = ASL_IMAGES if asl_images is None else asl_images
+    isl_images = ISL_IMAGES if isl_images is None else isl_images
+    uploads = UPLOADED_SIGNS if uploads is None else uploads
+
+    with _sign_index_lock:
+        index = build_sign_index(
+            video_files=videos.values(),
+            asl_files=asl_images.values(),
+            isl_files=isl_images.values(),
+            resolvers=SIGN_RESOLVERS,
+            char_maps=regional_char_maps,
+            uploads=uploads,
+            corrections=SIGN_CORRECTIONS,
+            version=next(_sign_index_versions)
+        )
+        _sign_index = index
+    logger.info("Sign index v%d built", index.version)
+    return index
+
+def apply_sign_corrections(entries):
+    """Apply reviewed feedback entries as sign corrections and swap in the corrected index.
+
+    Only entries a reviewer has marked processed, or that carry approved=True,
+    are used; raw submissions never change what other users see. Entries for a
+    language without sign resolvers are skipped. Only the new pairs are
+    compiled; the version bump invalidates SIGN_CACHE. Returns the entries
+    that were applied.
+    """
+    global _sign_index
+    applied = []
+    new = {}
+    for entry in entries:
+        if not (entry.get('processed') or entry.get('approved')):
+            continue
+        original = ' '.join(str(entry.get('original') or '').lower().split())
+        corrected = ' '.join(str(entry.get('correction') or '').split())
+        if not original or not corrected:
+            continue
+        language = (entry.get('language') or '').lower() or None
+        if language is not None and language not in SIGN_RESOLVERS:
+            logger.warning("Ignoring feedback correction for unknown language %r", language)
+            continue
+        new.setdefault(language, {})[original] = corrected
+        applied.append(entry)
+
+    if new:
+        with _sign_index_lock:
+            for language, pairs in new.items():
+                SIGN_CORRECTIONS.setdefault(language, {}).update(pairs)
+            if _sign_index is not None:
+                _sign_index = _sign_index.with_corrections(new, next(_sign_index_versions))
+                logger.info("Sign index v%d: applied %d feedback corrections", _sign_index.version, len(applied))
+    return applied
+
 def verify_telugu_model():
     """Verify Telugu model specifically"""
     print("\nVerifying Telugu speech recognition model:")
@@ -1129,6 +1064,7 @@ def verify_telugu_model():
     return True
 
 def analyze_sentiment(text):
+    from textblob import TextBlob  # Imported on first use, it is slow to load
     analysis = TextBlob(text)
     # Get polarity score (-1 to 1, where -1 is negative, 0 is neutral, 1 is positive)
     polarity = analysis.sentiment.polarity
@@ -1141,6 +1077,82 @@ def analyze_sentiment(text):
     else:
         return "neutral"
 
+# Uploaded audio is transcribed with the local Vosk models in worker processes
+# (TRANSCRIBE_WORKERS, 0 to decode in the request thread). Each worker loads its
+# own copy of every model it decodes with, so memory grows with the worker count
+transcriber = OfflineTranscriber(workers=int(os.environ.get('TRANSCRIBE_WORKERS', DEFAULT_TRANSCRIBE_WORKERS)))
+
+# Recognition languages used when an upload has to go to Google instead
+GOOGLE_LANGUAGE_CODES = {
+    'asl': 'en-US',
+    'isl': 'en-IN',
+    'hindi': 'hi-IN',
+    'telugu': 'te-IN',
+    'gujarati': 'gu-IN'
+}
+
+def local_model_path(language):
+    """The language's Vosk model directory, or None if it cannot be used"""
+    try:
+        return vosk_model_path(language)
+    except (ValueError, FileNotFoundError):
+        return None
+
+def recognize_with_google(path, language='asl'):
+    """Online fallback for uploads without a local model or in other formats"""
+    import speech_recognition as sr  # Imported on first use, it is slow to load
+    recognizer = sr.Recognizer()
+    with sr.AudioFile(path) as source:
+        audio = recognizer.record(source)
+    return recognizer.recognize_google(audio, language=GOOGLE_LANGUAGE_CODES.get(language, 'en-US'))
+
+def _save_upload(audio_file):
+    suffix = os.path.splitext(audio_file.filename or '')[1].lower() or '.wav'
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
+        audio_file.save(f)
+        return f.name
+
+def transcribe_uploads(audio_files, language='asl'):
+    """Transcribe uploaded audio files and resolve each transcript to signs.
+
+    Files are decoded with the local Vosk model in parallel; those it cannot
+    handle (no model for the language, or not mono 16-bit PCM WAV/raw PCM)
+    go to Google. Returns one dict per file, in order: {'text', 'video_paths',
+    'method'} plus, for local decoding, time-aligned 'signs', 'words' and
+    'duration', or {'error'} if the file failed.
+    """
+    language = language.lower()
+    model_path = local_model_path(language)
+    paths = [_save_upload(audio_file) for audio_file in audio_files]
+    try:
+        local = [i for i, path in enumerate(paths) if model_path and is_supported(path)]
+        transcripts = dict(zip(local, transcriber.transcribe_many([(paths[i], model_path) for i in local])))
+
+        index = get_sign_index()
+        results = []
+        for i, path in enumerate(paths):
+            try:
+                transcript = transcripts.get(i)
+                if isinstance(transcript, Exception):
+                    raise transcript
+                if transcript is None:
+                    transcript = {'text': recognize_with_google(path, language), 'method': 'google'}
+                else:
+                    transcript['method'] = 'vosk'
+                    transcript['signs'] = align_signs(transcript['words'], index, language) if index else []
+                transcript['video_paths'] = text_to_sign(transcript['text'], language, index=index) if transcript['text'] else []
+                results.append(transcript)
+            except Exception as e:
+                logger.warning("Error transcribing %s: %s", audio_files[i].filename, e)
+                results.append({'error': str(e)})
+        return results
+    finally:
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
 @app.route('/process_audio', methods=['POST'])
 def process_audio():
     # Get the audio file from the request
@@ -1148,26 +1160,24 @@ def process_audio():
         return jsonify({'error': 'No audio file provided'})
     
     audio_file = request.files['audio']
+    language = request.form.get('language', 'asl')
     
     try:
-        # Convert audio to text using speech recognition
-        recognizer = sr.Recognizer()
-        with sr.AudioFile(audio_file) as source:
-            audio = recognizer.record(source)
-            
-        # Get the transcribed text
-        text = recognizer.recognize_google(audio)
+        # Transcribe locally where possible, Google otherwise
+        result = transcribe_uploads([audio_file], language)[0]
+        if 'error' in result:
+            return jsonify(result)
+        text = result['text']
         
         # Add sentiment analysis
         sentiment = analyze_sentiment(text)
         
-        # Convert text to sign language paths
-        sign_paths = text_to_sign(text)
-        
         return jsonify({
             'text': text,
             'sentiment': sentiment,
-            'sign_paths': sign_paths
+            'sign_paths': result['video_paths'],
+            'signs': result.get('signs', []),
+            'method': result['method']
         })
     except Exception as e:
         return jsonify({'error': str(e)})
@@ -1181,14 +1191,16 @@ def initialize_upload_directories():
     try:
         # Create main uploads directory
         os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-        print(f"\nCreated main upload directory: {UPLOAD_FOLDER}")
+        if VERBOSE_STARTUP:
+            print(f"\nCreated main upload directory: {UPLOAD_FOLDER}")
         
         # Create language-specific directories
         languages = ['asl', 'isl', 'hindi', 'telugu', 'gujarati']
         for lang in languages:
             lang_dir = os.path.join(UPLOAD_FOLDER, lang)
             os.makedirs(lang_dir, exist_ok=True)
-            print(f"Created language directory: {lang_dir}")
+            if VERBOSE_STARTUP:
+                print(f"Created language directory: {lang_dir}")
         
         # Create and initialize log file
         log_file = os.path.join(UPLOAD_FOLDER, 'uploads.log')
@@ -1197,12 +1209,13 @@ def initialize_upload_directories():
                 f.write("Upload Log File Created\n")
             print(f"Created upload log file: {log_file}")
             
-        # Verify permissions
-        for root, dirs, files in os.walk(UPLOAD_FOLDER):
-            os.chmod(root, 0o755)  # rwxr-xr-x
-            print(f"Set permissions for: {root}")
-            
-        print("\nUpload directory structure initialized successfully!")
+        # Resetting permissions walks every upload directory, so it only runs
+        # with STARTUP_MODE=verbose
+        if VERBOSE_STARTUP:
+            for root, dirs, files in os.walk(UPLOAD_FOLDER):
+                os.chmod(root, 0o755)  # rwxr-xr-x
+                print(f"Set permissions for: {root}")
+            print("\nUpload directory structure initialized successfully!")
         return True
         
     except Exception as e:
@@ -1210,23 +1223,112 @@ def initialize_upload_directories():
         return False
 
 # Initialize directories when the app starts
-if not initialize_upload_directories():
+with startup_timer.stage('upload_dirs'):
+    upload_ok = initialize_upload_directories()
+if not upload_ok:
     print("Failed to initialize upload directories. Exiting.")
     sys.exit(1)
 
+def scan_uploaded_signs():
+    """Catalog the signs uploaded for each language, keyed by word"""
+    uploads = {}
+    for language in ['asl', 'isl', 'hindi', 'telugu', 'gujarati']:
+        lang_dir = os.path.join(UPLOAD_FOLDER, language)
+        uploads[language] = {}
+        if os.path.isdir(lang_dir):
+            for file in os.listdir(lang_dir):
+                if allowed_file(file):
+                    uploads[language][file.rsplit('.', 1)[0].lower()] = file
+    return uploads
+
+def _catalog_for(directory):
+    """Return the catalog dict and file suffix that a media directory is tracked in"""
+    directory = os.path.abspath(directory)
+    if directory == os.path.abspath(VIDEOS_PATH):
+        return AVAILABLE_VIDEOS, '.mp4'
+    if directory == os.path.abspath(ALPHABET_IMAGES_PATH):
+        return ASL_IMAGES, '_test.jpg'
+    if directory == os.path.abspath(INDIAN_ALPHABET_IMAGES_PATH):
+        return ISL_IMAGES, '.jpg'
+    if os.path.dirname(directory) == os.path.abspath(UPLOAD_FOLDER):
+        return UPLOADED_SIGNS.setdefault(os.path.basename(directory), {}), None
+    return None, None
+
+def _catalog_key(file, suffix):
+    if suffix is None:
+        return file.rsplit('.', 1)[0].lower() if allowed_file(file) else None
+    return file[:-len(suffix)].lower() if file.endswith(suffix) else None
+
+# Called with the directory after every reported media change, for caches
+# derived from the media files (e.g. alphabet bundles)
+MEDIA_CHANGE_LISTENERS = []
+
+def apply_media_changes(directory, added=(), removed=(), modified=()):
+    """Patch the media catalog with files added to or removed from one directory.
+
+    Only the named files are touched; the sign index is rebuilt from the patched
+    catalog and swapped in if anything actually changed. Modified files keep
+    their catalog entry but are reported to MEDIA_CHANGE_LISTENERS like any
+    other change.
+    """
+    if added or removed or modified:
+        for listener in MEDIA_CHANGE_LISTENERS:
+            try:
+                listener(directory)
+            except Exception as e:
+                logger.error("Error in media change listener for %s: %s", directory, e)
+
+    with _sign_index_lock:
+        catalog, suffix = _catalog_for(directory)
+        if catalog is None:
+            return False
+
+        changed = False
+        for file in removed:
+            key = _catalog_key(file, suffix)
+            if key is not None and catalog.get(key) == file:
+                del catalog[key]
+                changed = True
+        for file in added:
+            key = _catalog_key(file, suffix)
+            if key is not None and catalog.get(key) != file:
+                catalog[key] = file
+                changed = True
+
+        if changed:
+            logger.info("Media catalog updated for %s: +%d -%d", directory, len(added), len(removed))
+            rebuild_sign_index()
+        return changed
+
+_media_watcher = None
+
+def start_media_watcher(interval=None):
+    """Start watching the media and upload directories for hot reload (idempotent)"""
+    global _media_watcher
+    if _media_watcher is None:
+        interval = interval or float(os.environ.get('MEDIA_WATCH_INTERVAL', '2.0'))
+        directories = [VIDEOS_PATH, ALPHABET_IMAGES_PATH, INDIAN_ALPHABET_IMAGES_PATH]
+        directories += [os.path.join(UPLOAD_FOLDER, lang) for lang in UPLOADED_SIGNS]
+        _media_watcher = MediaWatcher(directories, apply_media_changes, interval=interval).start()
+    return _media_watcher
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+# Build the sign index once the media and upload catalogs are complete
+with startup_timer.stage('sign_index'):
+    UPLOADED_SIGNS.update(scan_uploaded_signs())
+    rebuild_sign_index()
+
 @app.route('/upload_sign', methods=['POST'])
 def upload_sign():
     try:
         # Use current directory path
         upload_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "uploads")
-        print("\nDebug: Starting file upload...")
-        print(f"Upload folder path: {upload_path}")
+        logger.debug("Starting file upload to %s", upload_path)
         
         if 'file' not in request.files:  # Changed from 'video' to 'file'
-            print("Debug: No file in request")
+            logger.debug("No file in request")
             return jsonify({'error': 'No file provided'}), 400
             
         uploaded_file = request.files['file']  # Changed from video to file
@@ -1237,7 +1339,7 @@ def upload_sign():
         language = request.form.get('language', '')
         file_type = request.form.get('type', 'video')  # Add file type parameter
         
-        print(f"Debug: Received upload - Word: {word}, Language: {language}, Type: {file_type}")
+        logger.debug("Received upload - Word: %s, Language: %s, Type: %s", word, language, file_type)
         
         # Check file extension
         file_ext = uploaded_file.filename.rsplit('.', 1)[1].lower()
@@ -1251,16 +1353,18 @@ def upload_sign():
         # Save file with appropriate extension
         filename = secure_filename(f"{word}.{file_ext}")
         filepath = os.path.join(language_dir, filename)
-        print(f"Saving to: {filepath}")
         
         uploaded_file.save(filepath)
         
         if os.path.exists(filepath):
-            print(f"File saved successfully: {filepath}")
+            logger.info("Sign uploaded: %s", filepath)
             # Log the upload
             log_path = os.path.join(upload_path, 'uploads.log')
             with open(log_path, 'a') as f:
                 f.write(f"Uploaded: {language}/{filename} - Type: {file_type}\n")
+
+            # Make the new sign available right away instead of on the next watcher poll
+            apply_media_changes(language_dir, added=[filename])
             
             return jsonify({
                 'success': True,
@@ -1268,27 +1372,25 @@ def upload_sign():
                 'path': filepath
             })
         else:
-            print("File not saved!")
+            logger.error("Upload not saved: %s", filepath)
             return jsonify({'error': 'Failed to save file'}), 500
             
     except Exception as e:
-        print(f"Upload error: {str(e)}")
-        traceback.print_exc()
+        logger.exception("Upload error: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/check_upload_dirs', methods=['GET'])
 def check_upload_dirs():
     try:
         structure = {}
-        print(f"\nChecking upload directory structure...")
-        print(f"Base upload folder: {UPLOAD_FOLDER}")
+        logger.debug("Checking upload directory structure under %s", UPLOAD_FOLDER)
         
         if not os.path.exists(UPLOAD_FOLDER):
             return jsonify({'error': 'Upload folder does not exist'}), 404
             
         for language in ['asl', 'isl', 'hindi', 'telugu', 'gujarati']:
             lang_dir = os.path.join(UPLOAD_FOLDER, language)
-            print(f"Checking {language} directory: {lang_dir}")
+            logger.debug("Checking %s directory: %s", language, lang_dir)
             
             if os.path.exists(lang_dir):
                 files = os.listdir(lang_dir)
@@ -1316,5 +1418,5 @@ def check_upload_dirs():
         
         return jsonify(structure)
     except Exception as e:
-        print(f"Error checking directories: {str(e)}")
+        logger.error("Error checking directories: %s", e)
         return jsonify({'error': str(e)}), 500